@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+config file lookup shared by the scripts and the job_finder command line:
+an explicit path, then the JOB_FINDER_CONFIG environment variable, then config2.yaml
+"""
+import os
+
+import yaml
+
+CONFIG_ENV = 'JOB_FINDER_CONFIG'
+DEFAULT_CONFIG = 'config2.yaml'
+
+
+def config_path(path: str = None) -> str:
+    """Path of the config file to use."""
+    return path or os.environ.get(CONFIG_ENV) or DEFAULT_CONFIG
+
+
+def load_config(path: str = None) -> dict:
+    """Load configuration from YAML file."""
+    with open(config_path(path), 'r') as file:
+        return yaml.safe_load(file)
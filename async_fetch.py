@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+asyncio fetch engine used to pull many job pages concurrently
+while respecting the per-host rate limit
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Iterable, Iterator, Optional, Tuple
+
+from http_client import BASE_HEADERS, ScraperClient
+from rate_limit import HostRateLimiter
+
+
+class AsyncScraperClient:
+    """
+    aiohttp counterpart of ScraperClient for use on an event loop.
+
+    It wraps a ScraperClient and shares its disk cache, per-host rate
+    limiter, AIMD throttling, retry policy, stats and metrics; only the
+    network calls differ. Requests wait for rate limiter tokens on the
+    event loop instead of blocking a thread. Call open() and close() from
+    the loop that uses the client.
+    """
+
+    def __init__(self, client: ScraperClient, concurrency: int = 4):
+        self.client = client
+        self.concurrency = max(1, int(concurrency))
+        self.session = None
+
+    async def open(self):
+        import aiohttp
+
+        self._errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        self.session = aiohttp.ClientSession(
+            headers=BASE_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.client.timeout),
+            connector=aiohttp.TCPConnector(limit_per_host=self.concurrency),
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, url: str) -> Optional[bytes]:
+        """Async ScraperClient.fetch: cached body, revalidated or fetched page, or None."""
+        client = self.client
+        # cache files are read and written off the loop
+        done, content, entry = await asyncio.to_thread(client.lookup, url)
+        if done:
+            return content
+
+        await client.limiter.acquire_async(url)
+        response = await self.get(url, headers=entry.validators() if entry else None)
+        if response is None:
+            return client.serve_stale(url, entry)
+        status, body, headers = response
+        return await asyncio.to_thread(client.store, url, entry, status, body, headers)
+
+    async def get(self, url: str, headers: dict = None):
+        """
+        GET a url with the ScraperClient retry policy.
+
+        Returns:
+            tuple: (status, body, headers) of the final response (including 304s),
+            or None if every attempt failed.
+        """
+        client = self.client
+        for attempt in range(client.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(client.retry_delay(attempt))
+                await client.limiter.acquire_async(url)
+
+            client._count('requests')
+            started = time.monotonic()
+            try:
+                async with self.session.get(url, headers=client.request_headers(headers)) as response:
+                    body = await response.read()
+                    status, response_headers = response.status, response.headers
+            except self._errors as e:
+                client.request_failed(url, e)
+                continue
+            outcome = client.check_response(url, status, time.monotonic() - started, len(body))
+            if outcome == 'retry':
+                continue
+            if outcome == 'error':
+                return None
+            return status, body, response_headers
+
+        client._count('errors')
+        return None
+
+
+class EventLoopThread:
+    """
+    An event loop running on a background thread with one AsyncScraperClient,
+    so synchronous code can submit coroutines to it and wait on the results.
+    """
+
+    def __init__(self, client: ScraperClient, concurrency: int = 4):
+        self.http = AsyncScraperClient(client, concurrency)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> 'EventLoopThread':
+        self._thread.start()
+        self.run(self.http.open())
+        return self
+
+    def __exit__(self, *exc):
+        self.run(self._shutdown())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def run(self, coroutine: Awaitable):
+        """Run a coroutine on the loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def submit(self, coroutine: Awaitable):
+        """Schedule a coroutine on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def _shutdown(self):
+        # cancel fetches still in flight when the consumer stopped early
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.http.close()
+
+
+AsyncWorker = Callable[[str, AsyncScraperClient], Awaitable]
+
+
+async def _run_one(worker: AsyncWorker, url: str, http: AsyncScraperClient):
+    try:
+        return await worker(url, http)
+    except Exception as e:
+        print(f"Error processing {url}: {e}")
+        return None
+
+
+def iter_fetch_async(urls: Iterable[str], worker: AsyncWorker, client: ScraperClient,
+                     concurrency: int = 4) -> Iterator[Tuple[str, object]]:
+    """
+    Run the coroutine `worker(url, http)` (e.g. extract_job_details_async) for
+    lazily produced urls, such as a paginated search, on an asyncio event loop.
+
+    The url source is consumed in the calling thread, since it blocks on
+    the network and writes to SQLite, and each url is handed to the loop
+    as soon as a slot frees up. At most `concurrency` fetches are in flight
+    and results are yielded in input order.
+
+    Args:
+        urls (Iterable[str]): urls to process.
+        worker (AsyncWorker): coroutine function taking a url and an AsyncScraperClient.
+        client (ScraperClient): supplies the cache, rate limiter and retry policy.
+        concurrency (int): maximum number of fetches in flight.
+
+    Yields:
+        tuple: (url, worker result), with None as the result where the worker raised.
+    """
+    concurrency = max(1, int(concurrency))
+    in_flight = deque()
+    with EventLoopThread(client, concurrency) as loop:
+        for url in urls:
+            in_flight.append((url, loop.submit(_run_one(worker, url, loop.http))))
+            if len(in_flight) >= concurrency:
+                done_url, future = in_flight.popleft()
+                yield done_url, future.result()
+        while in_flight:
+            done_url, future = in_flight.popleft()
+            yield done_url, future.result()
+
+
+def fetch_all(urls: Iterable[str], worker: AsyncWorker, client: ScraperClient, concurrency: int = 4) -> list:
+    """
+    Apply the coroutine `worker` to every url concurrently.
+
+    Returns:
+        list: worker results in the same order as `urls`, None where the worker raised.
+    """
+    return [result for _, result in iter_fetch_async(urls, worker, client, concurrency)]
+
+
+def iter_fetch(urls: Iterable[str], worker: Callable, limiter: Optional[HostRateLimiter] = None,
+               concurrency: int = 4) -> Iterator[Tuple[str, object]]:
+    """
+    Thread pool counterpart of iter_fetch_async for a blocking `worker`
+    (e.g. extract_job_details), used by fetch_mode "threaded".
+
+    Urls are pulled from `urls` only as worker slots free up and results are
+    yielded in input order, so at most `concurrency` jobs are in memory.
+
+    Yields:
+        tuple: (url, worker result), with None as the result where the worker raised.
+    """
+    concurrency = max(1, int(concurrency))
+
+    def run_one(url):
+        if limiter is not None:
+            limiter.acquire(url)
+        try:
+            return worker(url)
+        except Exception as e:
+            print(f"Error processing {url}: {e}")
+            return None
+
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for url in urls:
+            in_flight.append((url, executor.submit(run_one, url)))
+            if len(in_flight) >= concurrency:
+                done_url, future = in_flight.popleft()
+                yield done_url, future.result()
+        while in_flight:
+            done_url, future = in_flight.popleft()
+            yield done_url, future.result()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+bounded-concurrency batch generation of customized resumes
+and cover letters against the Anthropic messages API
+"""
+import asyncio
+import os
+import random
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+import anthropic
+
+import metrics
+
+from llm_cache import LLMResponseCache, request_fingerprint
+
+# a prompt is either a plain user message or a prebuilt request dict with
+# `system` and `messages` (see prompts.build_cached_request)
+Prompt = Union[str, dict]
+
+# (job key, resume prompt, cover letter prompt)
+JobPrompts = Tuple[Hashable, Prompt, Prompt]
+
+USAGE_FIELDS = ('input_tokens', 'cache_creation_input_tokens', 'cache_read_input_tokens', 'output_tokens')
+
+# rate limited, server errors and overloaded
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504, 529}
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, anthropic.APIConnectionError):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and error.status_code in RETRYABLE_STATUSES
+
+
+class BatchGenerator:
+    """
+    Generates resume and cover letter pairs for many jobs with one shared
+    async client. At most `concurrency` requests are in flight; each job's
+    two requests are issued in parallel. Rate limits, overloads and
+    connection errors are retried with exponential backoff, and a job that
+    still fails is reported with an error instead of stopping the batch.
+    With a `cache`, identical requests are answered locally without an API call.
+    """
+
+    def __init__(self, model: str, system_prompt: str, max_tokens: int = 2000, temperature: Optional[float] = 0.7,
+                 concurrency: int = 4, max_retries: int = 5, backoff: float = 2.0,
+                 api_key: str = None, base_url: str = None, client=None,
+                 cache: Optional[LLMResponseCache] = None):
+        self.model = model
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.concurrency = max(1, int(concurrency))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.base_url = base_url
+        self.client = client
+        self.cache = cache
+        self.usage = Counter()
+
+    def _sampling_kwargs(self) -> dict:
+        # sent as a raw body field: newer SDK releases dropped the typed temperature argument
+        return {"extra_body": {"temperature": self.temperature}} if self.temperature is not None else {}
+
+    def _make_client(self):
+        # retries are handled here so they share the concurrency limit and backoff
+        return anthropic.AsyncAnthropic(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+
+    def _request_kwargs(self, prompt: Prompt) -> dict:
+        if isinstance(prompt, dict):
+            return {"system": prompt["system"], "messages": prompt["messages"]}
+        return {"system": self.system_prompt, "messages": [{"role": "user", "content": prompt}]}
+
+    def _record_usage(self, usage):
+        self.usage['requests'] += 1
+        for field in USAGE_FIELDS:
+            tokens = getattr(usage, field, None) or 0
+            self.usage[field] += tokens
+            metrics.inc('llm_tokens_total', tokens, type=field)
+
+    def fingerprint(self, prompt: Prompt) -> str:
+        """Cache key of a prompt under this generator's model and sampling parameters."""
+        request = self._request_kwargs(prompt)
+        params = {"max_tokens": self.max_tokens, "temperature": self.temperature}
+        return request_fingerprint(self.model, params, request["system"], request["messages"])
+
+    async def _complete(self, semaphore: asyncio.Semaphore, prompt: Prompt, force: bool = False) -> str:
+        """Send one prompt, retrying retryable errors; returns the response text."""
+        fingerprint = None
+        if self.cache is not None:
+            fingerprint = self.fingerprint(prompt)
+            if force:
+                self.cache.stats['bypassed'] += 1
+            else:
+                cached = self.cache.get(fingerprint)
+                if cached is not None:
+                    metrics.inc('llm_requests_total', result='cached')
+                    return cached
+
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                try:
+                    with metrics.timer('llm_request_seconds', model=self.model):
+                        response = await self.client.messages.create(
+                            model=self.model,
+                            max_tokens=self.max_tokens,
+                            **self._request_kwargs(prompt),
+                            **self._sampling_kwargs(),
+                        )
+                    metrics.inc('llm_requests_total', result='ok')
+                    self._record_usage(response.usage)
+                    text = ''.join(block.text for block in response.content if block.type == 'text')
+                    if fingerprint is not None:
+                        self.cache.put(fingerprint, self.model, text)
+                    return text
+                except anthropic.APIError as e:
+                    status = getattr(e, 'status_code', None) or type(e).__name__
+                    if attempt == self.max_retries or not is_retryable(e):
+                        metrics.inc('llm_requests_total', result='error', status=status)
+                        raise
+                    metrics.inc('llm_requests_total', result='retry', status=status)
+                    error = e
+            # back off outside the semaphore so other requests can use the slot
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"{type(error).__name__}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _generate_job(self, semaphore: asyncio.Semaphore, job: JobPrompts, force: bool) -> Tuple[Hashable, dict]:
+        key, resume_prompt, cover_letter_prompt = job
+        try:
+            with metrics.timer('job_generation_seconds'):
+                resume, cover_letter = await asyncio.gather(
+                    self._complete(semaphore, resume_prompt, force),
+                    self._complete(semaphore, cover_letter_prompt, force),
+                )
+        except Exception as e:
+            print(f"Generation failed for {key}: {e}")
+            return key, {"error": f"{type(e).__name__}: {e}"}
+        return key, {"customized_resume": resume, "customized_cover_letter": cover_letter}
+
+    async def run(self, jobs: List[JobPrompts], force_keys=()) -> Dict[Hashable, dict]:
+        """
+        Generate materials for every job.
+
+        Args:
+            jobs (List[JobPrompts]): (key, resume prompt, cover letter prompt) per job.
+            force_keys: job keys to regenerate even when a cached response exists.
+
+        Returns:
+            Dict[Hashable, dict]: per job key either customized_resume and
+            customized_cover_letter, or an error message.
+        """
+        owns_client = self.client is None
+        if owns_client:
+            self.client = self._make_client()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            force_keys = set(force_keys)
+            results = await asyncio.gather(*(
+                self._generate_job(semaphore, job, job[0] in force_keys) for job in jobs))
+        finally:
+            if owns_client:
+                await self.client.close()
+                self.client = None
+        return dict(results)
+
+    def generate(self, jobs: List[JobPrompts], force_keys=()) -> Dict[Hashable, dict]:
+        """Blocking wrapper around run()."""
+        return asyncio.run(self.run(jobs, force_keys))
+
+    def usage_report(self) -> str:
+        """Cached vs uncached input tokens for the batch so far."""
+        cached = self.usage['cache_read_input_tokens']
+        total_input = cached + self.usage['cache_creation_input_tokens'] + self.usage['input_tokens']
+        share = cached / total_input if total_input else 0.0
+        return (
+            f"{self.usage['requests']} requests: {total_input} input tokens "
+            f"({cached} read from cache, {self.usage['cache_creation_input_tokens']} written to cache, "
+            f"{self.usage['input_tokens']} uncached; {share:.0%} cached), "
+            f"{self.usage['output_tokens']} output tokens"
+        )
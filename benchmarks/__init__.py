@@ -0,0 +1,5 @@
+"""
+offline benchmark suite: a generated corpus of saved search/job pages and
+sample .docx files, replayed through the real scraper, parser, docx and
+prompt code paths
+"""
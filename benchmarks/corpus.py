@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+deterministic benchmark corpus: LinkedIn-like search and job pages seeded
+from job_links.txt, stored in a replay-mode http cache, plus sample .docx files
+"""
+import json
+import random
+import re
+from pathlib import Path
+from typing import List
+
+from docx import Document
+
+from http_cache import ResponseCache
+from job_index import canonical_job_url, job_id_from_url
+from linkedin_job_scraper import RESULTS_PER_PAGE, build_search_url
+
+# bump when generated pages change so an old corpus directory is rebuilt
+CORPUS_VERSION = 1
+
+BENCH_CONFIG = {
+    'job_search': {
+        'location': 'Charlotte, NC',
+        'job_titles': ['Data Science Manager', 'Software Engineer'],
+        'max_results': 100,
+        'max_pages': 3,
+        'time_filter': 'r86400',
+    },
+    'linkedin': {'base_url': 'https://www.linkedin.com/jobs/search'},
+}
+
+WORDS = ('data science machine learning model python sql pipeline platform team lead manage deliver '
+         'stakeholder analytics cloud aws experiment product customer risk credit fraud forecast '
+         'deploy monitor mentor strategy roadmap insight dashboard statistics regression deep').split()
+SECTIONS = ('About the role', 'Responsibilities', 'Qualifications', 'Preferred skills', 'Benefits')
+BOILERPLATE = ('We are an equal opportunity employer and value diversity at our company. '
+               'We offer medical, dental and vision insurance, a 401k match and paid time off.')
+PAY = ('$150,000.00/yr - $190,000.00/yr', '$55/hr - $70/hr', '$120K - $160K', None)
+
+
+def seed_links(links_path: str = 'job_links.txt') -> List[str]:
+    """Canonical job urls from a file of LinkedIn job links, one per line."""
+    with open(links_path, 'r', encoding='utf-8') as f:
+        urls = [canonical_job_url(line.strip()) for line in f if '/jobs/view/' in line]
+    return list(dict.fromkeys(url for url in urls if job_id_from_url(url)))
+
+
+def _slug_words(url: str) -> List[str]:
+    return re.sub(r'-\d+$', '', url.rstrip('/').rsplit('/', 1)[-1]).split('-')
+
+
+def job_page(url: str, rng: random.Random) -> bytes:
+    """A job posting page shaped like LinkedIn's guest job view, roughly the size of a real one."""
+    words = _slug_words(url)
+    split = words.index('at') if 'at' in words else len(words)
+    title = ' '.join(words[:split]).title() or 'Data Scientist'
+    company = ' '.join(words[split + 1:]).title() or 'Acme'
+
+    parts = []
+    for heading in SECTIONS:
+        bullets = ''.join(f"<li>{' '.join(rng.choices(WORDS, k=rng.randint(8, 20)))}.</li>"
+                          for _ in range(rng.randint(3, 8)))
+        parts.append(f"<p><strong>{heading}</strong></p><p>{' '.join(rng.choices(WORDS, k=60))}.</p><ul>{bullets}</ul>")
+    parts.append(f"<p>{BOILERPLATE}</p>")
+    pay = rng.choice(PAY)
+    similar = ''.join(
+        f"<li class='similar-jobs__list-item'><a href='https://www.linkedin.com/jobs/view/{rng.randint(10**9, 10**10)}'>"
+        f"<h3>{' '.join(rng.choices(WORDS, k=4)).title()}</h3><h4>{rng.choice(WORDS).title()} Inc</h4>"
+        f"<span>{rng.randint(1, 30)} days ago</span></a></li>" for _ in range(150))
+    html = f"""<!DOCTYPE html><html lang="en"><head><title>{title} | {company} | LinkedIn</title>
+<script>window.__config = {json.dumps({'tracking': ''.join(rng.choices(WORDS, k=3000))})};</script>
+<style>.top-card-layout{{display:flex}}</style></head><body>
+<nav class="nav"><a href="/">LinkedIn</a><a href="/jobs">Jobs</a><a href="/login">Sign in</a></nav>
+<main><section class="top-card-layout"><h1 class="top-card-layout__title">{title}</h1>
+<h4 class="top-card-layout__second-subline"><a data-tracking-control-name="job_details_topcard_company_url" href="#">{company}</a>
+<span>Charlotte, NC</span><span>{rng.randint(1, 20)} days ago</span><span>{rng.randint(20, 200)} applicants</span></h4></section>
+{f'<div class="compensation__salary-range"><div class="compensation__salary">{pay}</div></div>' if pay else ''}
+<section class="description"><div class="show-more-less-html__markup">{''.join(parts)}</div></section>
+<ul class="description__job-criteria-list"><li>Seniority level: Mid-Senior level</li><li>Employment type: Full-time</li></ul>
+<section class="similar-jobs"><ul>{similar}</ul></section></main>
+<footer>{' '.join(f'<a href="/legal/{w}">{w}</a>' for w in WORDS)}</footer></body></html>"""
+    return html.encode('utf-8')
+
+
+def search_page(job_urls: List[str], rng: random.Random) -> bytes:
+    """A search results page linking to `job_urls` with LinkedIn-style tracking parameters."""
+    cards = ''.join(
+        f"<li><div class='base-card'><a class='base-card__full-link' href='{url}?position={i + 1}&pageNum=0"
+        f"&refId={rng.getrandbits(64):x}&trackingId={rng.getrandbits(64):x}'><span>{' '.join(_slug_words(url)).title()}</span></a>"
+        f"<div class='base-search-card__info'><h4>{rng.choice(WORDS).title()}</h4><time>{rng.randint(1, 23)} hours ago</time></div></div></li>"
+        for i, url in enumerate(job_urls))
+    return f"<html><body><main><ul class='jobs-search__results-list'>{cards}</ul></main></body></html>".encode('utf-8')
+
+
+def build_docx(path: Path, kind: str, rng: random.Random):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = 'Jordan Smith | jordan@example.com | Charlotte, NC'
+    doc.add_paragraph('Jordan Smith', style='Title')
+    if kind == 'resume':
+        doc.add_heading('Summary', 1)
+        doc.add_paragraph(' '.join(rng.choices(WORDS, k=60)))
+        doc.add_heading('Professional Experience', 1)
+        for _ in range(4):
+            table = doc.add_table(rows=1, cols=2)
+            table.cell(0, 0).text = f"{rng.choice(WORDS).title()} Corp - Manager"
+            table.cell(0, 1).text = f"{rng.randint(2010, 2020)} - {rng.randint(2021, 2025)}"
+            for _ in range(5):
+                doc.add_paragraph(' '.join(rng.choices(WORDS, k=18)), style='List Bullet')
+        doc.add_heading('Skills', 1)
+        doc.add_paragraph(', '.join(rng.sample(WORDS, 15)))
+        doc.add_heading('Education', 1)
+        doc.add_paragraph('MS Statistics, State University')
+    else:
+        for _ in range(5):
+            doc.add_paragraph(' '.join(rng.choices(WORDS, k=80)))
+    doc.save(path)
+
+
+def build_corpus(out_dir='benchmarks/corpus', links_path: str = 'job_links.txt', seed: int = 0) -> dict:
+    """
+    Generate the corpus into `out_dir` unless an up to date one is already there.
+
+    Returns:
+        dict: manifest with the cache dir, search config, job urls and docx paths.
+    """
+    out_dir = Path(out_dir)
+    manifest_path = out_dir / 'manifest.json'
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == CORPUS_VERSION and manifest.get('seed') == seed:
+            return manifest
+
+    rng = random.Random(seed)
+    cache = ResponseCache(out_dir / 'http_cache', mode='normal')
+    job_urls = seed_links(links_path)
+    for url in job_urls:
+        cache.put(url, job_page(url, rng))
+
+    # each title pages through the seed links (wrapping around), then hits an empty last page
+    per_title = BENCH_CONFIG['job_search']['max_pages'] - 1
+    search_urls = []
+    for t, title in enumerate(BENCH_CONFIG['job_search']['job_titles']):
+        for page in range(per_title + 1):
+            offset = (t * per_title + page) * RESULTS_PER_PAGE
+            links = [job_urls[(offset + i) % len(job_urls)] for i in range(RESULTS_PER_PAGE)] if page < per_title else []
+            url = build_search_url(BENCH_CONFIG, title, page * RESULTS_PER_PAGE)
+            cache.put(url, search_page(links, rng))
+            search_urls.append(url)
+
+    build_docx(out_dir / 'resume.docx', 'resume', rng)
+    build_docx(out_dir / 'cover_letter.docx', 'cover_letter', rng)
+    manifest = {
+        'version': CORPUS_VERSION,
+        'seed': seed,
+        'cache_dir': str(out_dir / 'http_cache'),
+        'config': BENCH_CONFIG,
+        'job_urls': job_urls,
+        'search_urls': search_urls,
+        'resume': str(out_dir / 'resume.docx'),
+        'cover_letter': str(out_dir / 'cover_letter.docx'),
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
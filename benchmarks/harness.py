@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+timing, memory and baseline comparison helpers for the benchmark suite
+"""
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+# metrics compared against the baseline, with the smallest change worth reporting
+REGRESSION_METRICS = {'p50_ms': 0.05, 'p90_ms': 0.05, 'peak_kb': 64}
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def run_benchmark(name: str, fn: Callable, items: Sequence, repeat: int = 3, warmup: int = 1,
+                  units_per_item: int = 1, unit: str = 'calls') -> dict:
+    """
+    Time `fn(item)` for every item, `repeat` times after `warmup` passes,
+    then trace one more pass with tracemalloc for memory figures. Output
+    printed by `fn` is discarded so it does not skew the timings.
+
+    Returns:
+        dict: calls, per-call latency percentiles and mean in ms, throughput in
+            `unit`/sec, peak traced memory and memory/blocks still held after the pass.
+    """
+    sink = io.StringIO()
+    latencies = []
+    with contextlib.redirect_stdout(sink):
+        for _ in range(warmup):
+            for item in items:
+                fn(item)
+        gc.collect()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for item in items:
+                t0 = time.perf_counter_ns()
+                fn(item)
+                latencies.append((time.perf_counter_ns() - t0) / 1e6)
+        elapsed = time.perf_counter() - started
+
+        # separate pass: tracemalloc slows allocation-heavy code too much to time under it
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        for item in items:
+            fn(item)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    retained = [stat for stat in after.compare_to(before, 'filename') if stat.size_diff > 0]
+    latencies.sort()
+    return {
+        'name': name,
+        'calls': len(latencies),
+        'p50_ms': round(percentile(latencies, 50), 4),
+        'p90_ms': round(percentile(latencies, 90), 4),
+        'p99_ms': round(percentile(latencies, 99), 4),
+        'mean_ms': round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        'throughput': round(len(latencies) * units_per_item / elapsed, 2) if elapsed else 0.0,
+        'unit': unit,
+        'peak_kb': round(peak / 1024, 1),
+        'retained_kb': round(sum(stat.size_diff for stat in retained) / 1024, 1),
+        'retained_blocks': sum(stat.count_diff for stat in retained),
+    }
+
+
+def environment() -> dict:
+    """Machine details stored with a baseline, since timings only compare on the same box."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def save_baseline(path: str, results: List[dict]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': {r['name']: r for r in results}}, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    """Baseline results by benchmark name, empty when there is no baseline yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != environment():
+        print(f"Warning: baseline {path} was recorded on a different environment: {baseline.get('environment')}")
+    return baseline.get('results', {})
+
+
+def compare(results: List[dict], baseline: Dict[str, dict], threshold: float = 0.25) -> List[str]:
+    """
+    Regressions of `results` against `baseline`: a metric more than
+    `threshold` (fractional) worse than its baseline value, ignoring
+    absolute changes below the per-metric floor in REGRESSION_METRICS.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result['name'])
+        if base is None:
+            continue
+        for metric, floor in REGRESSION_METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append(f"{result['name']}: {metric} {old} -> {new} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+
+def format_results(results: List[dict], baseline: Dict[str, dict] = None) -> str:
+    baseline = baseline or {}
+    lines = [f"{'benchmark':42s} {'calls':>6s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} "
+             f"{'throughput':>16s} {'peak KB':>9s} {'kept KB':>8s} {'vs base':>8s}"]
+    for r in results:
+        base = baseline.get(r['name'])
+        delta = f"{(r['p50_ms'] / base['p50_ms'] - 1) * 100:+.0f}%" if base and base.get('p50_ms') else ''
+        lines.append(f"{r['name']:42s} {r['calls']:6d} {r['p50_ms']:9.3f} {r['p90_ms']:9.3f} {r['p99_ms']:9.3f} "
+                     f"{r['throughput']:>10.1f} {r['unit'][:5]}/s {r['peak_kb']:9.1f} {r['retained_kb']:8.1f} {delta:>8s}")
+    return '\n'.join(lines)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+run the offline benchmark suite, compare against a JSON baseline and flag regressions
+
+usage (from the repo root):
+    python -m benchmarks.run_benchmarks                  # run and compare to benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --save-baseline  # record a new baseline
+    python -m benchmarks.run_benchmarks --only parse     # subset by name
+"""
+import argparse
+import json
+import sys
+import tempfile
+from functools import partial
+
+import docx_ingest
+from benchmarks.corpus import build_corpus
+from benchmarks.harness import compare, format_results, load_baseline, run_benchmark, save_baseline
+from html_parsing import PARSER_BACKENDS, parse_job_details
+from http_cache import ResponseCache
+from http_client import ScraperClient
+from linkedin_job_scraper import extract_job_details, get_job_links
+from prompts import build_cached_request, generate_cover_letter_prompt, generate_resume_prompt
+from rate_limit import HostRateLimiter
+from utils import load_docx_text
+
+
+def build_suite(manifest: dict, repeat: int):
+    """(name, fn, items, options) for every benchmark over the corpus in `manifest`."""
+    cache = ResponseCache(manifest['cache_dir'], mode='replay')
+    # replay mode never reaches the network, so the limiter never waits
+    client = ScraperClient(limiter=HostRateLimiter(rate=1e9, capacity=1e9), cache=cache)
+    job_urls = manifest['job_urls']
+    pages = [(url, cache.get(url).content) for url in job_urls]
+
+    suite = []
+    for backend in PARSER_BACKENDS:
+        suite.append((f"parse_job_details[{backend}]", lambda page, b=backend: parse_job_details(page[0], page[1], b),
+                      pages, {'unit': 'pages'}))
+    suite.append(("extract_job_details[replay]", partial(extract_job_details, client=client), job_urls,
+                  {'unit': 'pages'}))
+    search_pages = len(manifest['search_urls'])
+    suite.append(("get_job_links[replay]", lambda config: get_job_links(config, client), [manifest['config']],
+                  {'unit': 'pages', 'units_per_item': search_pages, 'repeat': repeat * 5}))
+
+    docx_paths = [manifest['resume'], manifest['cover_letter']]
+    suite.append(("load_docx_text[cold]", lambda path: docx_ingest.parse_docx(path).text, docx_paths,
+                  {'unit': 'docs', 'repeat': repeat * 5}))
+    warm_cache = tempfile.mkdtemp(prefix='docx_cache_')
+    suite.append(("load_docx_text[warm]", lambda path: docx_ingest.load_document(path, warm_cache).text,
+                  docx_paths, {'unit': 'docs', 'repeat': repeat * 20}))
+
+    resume = load_docx_text(manifest['resume'])
+    cover_letter = load_docx_text(manifest['cover_letter'])
+    jobs = [parse_job_details(url, content) for url, content in pages]
+    suite.append(("generate_resume_prompt", lambda job: generate_resume_prompt(
+        JOB_DESCRIPTION=job['job_description'], COMPANY_INFORMATION=job['company'], APPLICANT_RESUME=resume),
+        jobs, {'unit': 'prompts', 'repeat': repeat * 5}))
+    suite.append(("generate_cover_letter_prompt", lambda job: generate_cover_letter_prompt(
+        JOB_DESCRIPTION=job['job_description'], COMPANY_INFORMATION=job['company'], APPLICANT_RESUME=resume,
+        APPLICANT_PREVIOUS_COVER_LETTER=cover_letter), jobs, {'unit': 'prompts', 'repeat': repeat * 5}))
+    suite.append(("build_cached_request", lambda job: build_cached_request(
+        "cover_letter", job['job_description'], job['company'], resume, cover_letter),
+        jobs, {'unit': 'prompts', 'repeat': repeat * 5}))
+    return suite
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the offline benchmark suite.')
+    parser.add_argument('--corpus', default='benchmarks/corpus', help='corpus directory, generated if missing')
+    parser.add_argument('--links', default='job_links.txt', help='job links used to seed the corpus')
+    parser.add_argument('--baseline', default='benchmarks/baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='fractional slowdown flagged as a regression')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', help='only run benchmarks whose name contains this')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    manifest = build_corpus(args.corpus, args.links)
+    results = []
+    for name, fn, items, options in build_suite(manifest, args.repeat):
+        if args.only and args.only not in name:
+            continue
+        options = {'repeat': args.repeat, **options}
+        results.append(run_benchmark(name, fn, items, **options))
+        print(f"ran {name}")
+
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if not baseline:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to record one")
+    elif regressions:
+        print(f"{len(regressions)} regressions beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    else:
+        print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+learns boilerplate (EEO statements, benefits blurbs, "about us")
+repeated across scraped job descriptions and strips it before prompting
+"""
+from hashlib import blake2b
+import json
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+# scraped descriptions are flattened with get_text(strip=True), so paragraph
+# breaks are gone; a segment runs to a sentence end followed by a capital or
+# digit (including ones glued to the next word), a newline or a bullet.
+# matching segments is several times faster than splitting on lookarounds
+_SEGMENT = re.compile(r'[^.!?:;\n•]*(?:[.!?:;]+(?!\s*[A-Z0-9•])[^.!?:;\n•]*)*[.!?:;]*')
+
+# rough chars-per-token ratio used for reporting
+CHARS_PER_TOKEN = 4
+
+
+def split_segments(text: str) -> List[str]:
+    """Split a description into sentence-like segments."""
+    return [segment.strip() for segment in _SEGMENT.findall(text) if segment and not segment.isspace()]
+
+
+@lru_cache(maxsize=65536)
+def segment_hash(segment: str) -> str:
+    """64-bit hash of a segment ignoring case and whitespace (boilerplate repeats, so it is memoized)."""
+    normalized = ' '.join(segment.lower().split())
+    return blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """Hash of a whole description, to notice when a frozen job's text changes."""
+    return blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class BoilerplateDetector:
+    """
+    Counts in how many distinct postings each hashed segment appears,
+    globally and per company. A segment is boilerplate when it appears in
+    at least `min_jobs` postings overall or `min_company_jobs` postings of
+    the same company. Counts are updated incrementally as jobs are added
+    and can be saved between runs.
+
+    The segments stripped from a job are frozen the first time it is
+    stripped (until its description changes), so boilerplate learned from
+    later postings never changes the prompts, and LLM cache keys, of jobs
+    that were already generated.
+    """
+
+    def __init__(self, min_jobs: int = 3, min_company_jobs: int = 2, min_chars: int = 30,
+                 max_strip_fraction: float = 0.7):
+        self.min_jobs = min_jobs
+        self.min_company_jobs = min_company_jobs
+        self.min_chars = min_chars
+        self.max_strip_fraction = max_strip_fraction
+        self.global_counts = Counter()
+        self.company_counts = defaultdict(Counter)
+        self.seen_jobs = set()
+        # job_url -> {'source': hash of the raw description, 'removed': stripped digests}
+        self.frozen = {}
+
+    def _segments(self, text: str) -> List[Tuple[str, str]]:
+        """(segment, hash) pairs; segments shorter than min_chars get no hash and are always kept."""
+        return [(s, segment_hash(s) if len(s) >= self.min_chars else None) for s in split_segments(text)]
+
+    def add(self, job: dict, segments: List[Tuple[str, str]] = None) -> bool:
+        """Count the segments of one job; returns False if the job was already counted."""
+        if job['job_url'] in self.seen_jobs:
+            return False
+        self.seen_jobs.add(job['job_url'])
+        if segments is None:
+            segments = self._segments(job.get('job_description') or '')
+        hashes = {digest for _, digest in segments if digest is not None}
+        self.global_counts.update(hashes)
+        self.company_counts[job.get('company') or ''].update(hashes)
+        return True
+
+    def add_many(self, jobs: Iterable[dict]) -> int:
+        return sum(self.add(job) for job in jobs)
+
+    def strip(self, job: dict, segments: List[Tuple[str, str]] = None) -> Tuple[str, int]:
+        """
+        Remove boilerplate segments from a job's description.
+
+        Company-level matches are dropped first if they would remove more
+        than max_strip_fraction of the text (e.g. the same role reposted),
+        and the original text is kept if global matches alone still do.
+
+        Returns:
+            tuple: (cleaned description, number of characters removed).
+        """
+        text = job.get('job_description') or ''
+        if segments is None:
+            segments = self._segments(text)
+        return self._apply(text, segments, self._removed_digests(job, segments))
+
+    def _removed_digests(self, job: dict, segments: List[Tuple[str, str]]) -> set:
+        """Digests of the segments to strip; empty to keep the original text."""
+        text = job.get('job_description') or ''
+        company_counts = self.company_counts.get(job.get('company') or '')
+        hashed = [(s, digest) for s, digest in segments if digest is not None]
+        global_drop = {digest for _, digest in hashed if self.global_counts[digest] >= self.min_jobs}
+        company_drop = global_drop
+        if company_counts:
+            company_drop = global_drop | {digest for _, digest in hashed
+                                          if company_counts[digest] >= self.min_company_jobs}
+
+        for drop in (company_drop, global_drop):
+            removed = sum(len(s) for s, digest in hashed if digest in drop)
+            if text and removed / len(text) <= self.max_strip_fraction:
+                return drop
+        return set()
+
+    @staticmethod
+    def _apply(text: str, segments: List[Tuple[str, str]], drop: set) -> Tuple[str, int]:
+        """Text without the segments in `drop`; the original text when none of them occur."""
+        if not drop:
+            return text, 0
+        kept = [s for s, digest in segments if digest not in drop]
+        if len(kept) == len(segments):
+            return text, 0
+        removed = sum(len(s) for s, digest in segments if digest in drop)
+        return ' '.join(kept), removed
+
+    def strip_jobs(self, jobs: List[dict]) -> dict:
+        """
+        Strip boilerplate from every job in place, learning from them first.
+
+        Jobs stripped before with the same description get the same result,
+        and frozen results of jobs no longer in `jobs` are dropped.
+
+        Returns:
+            dict: report with jobs processed, characters and approximate tokens removed.
+        """
+        segmented = []
+        for job in jobs:
+            text = job.get('job_description') or ''
+            frozen = self.frozen.get(job['job_url'])
+            # a known job frozen with nothing to strip needs no segmenting at all
+            if job['job_url'] in self.seen_jobs and frozen is not None and not frozen['removed'] \
+                    and frozen['source'] == text_hash(text):
+                segmented.append(None)
+                continue
+            segments = self._segments(text)
+            self.add(job, segments)
+            segmented.append(segments)
+
+        chars_before = chars_removed = 0
+        frozen_now = {}
+        for job, segments in zip(jobs, segmented):
+            text = job.get('job_description') or ''
+            chars_before += len(text)
+            frozen = self.frozen.get(job['job_url'])
+            if segments is None:
+                frozen_now[job['job_url']] = frozen
+                continue
+            source = text_hash(text)
+            if frozen is None or frozen['source'] != source:
+                frozen = {'source': source, 'removed': sorted(self._removed_digests(job, segments))}
+            frozen_now[job['job_url']] = frozen
+            job['job_description'], removed = self._apply(text, segments, set(frozen['removed']))
+            chars_removed += removed
+        self.frozen = frozen_now
+        return {
+            'jobs': len(jobs),
+            'chars_before': chars_before,
+            'chars_removed': chars_removed,
+            'tokens_removed': chars_removed // CHARS_PER_TOKEN,
+        }
+
+    def save(self, path):
+        state = {
+            'global_counts': self.global_counts,
+            'company_counts': self.company_counts,
+            'seen_jobs': sorted(self.seen_jobs),
+            'frozen': self.frozen,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path, **kwargs) -> 'BoilerplateDetector':
+        """Load saved counts, or start empty if `path` does not exist yet."""
+        detector = cls(**kwargs)
+        if Path(path).exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            detector.global_counts = Counter(state['global_counts'])
+            for company, counts in state['company_counts'].items():
+                detector.company_counts[company] = Counter(counts)
+            detector.seen_jobs = set(state['seen_jobs'])
+            detector.frozen = state.get('frozen', {})
+        return detector
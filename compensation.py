@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+structured pay extraction: precompiled regexes turn salary text such as
+"$120,000 - $150,000/yr" or "$55/hr" into min/max/currency/period fields
+with annualized figures for filtering and sorting
+"""
+import re
+from typing import Iterable, Optional
+
+CURRENCIES = {'$': 'USD', 'usd': 'USD', '£': 'GBP', 'gbp': 'GBP', '€': 'EUR', 'eur': 'EUR', 'cad': 'CAD'}
+
+# working hours/weeks/months per year used to annualize pay
+ANNUAL_FACTORS = {'hourly': 2080, 'weekly': 52, 'monthly': 12, 'yearly': 1}
+
+PERIOD_WORDS = {
+    'hour': 'hourly', 'hr': 'hourly', 'hourly': 'hourly',
+    'week': 'weekly', 'wk': 'weekly', 'weekly': 'weekly',
+    'month': 'monthly', 'mo': 'monthly', 'monthly': 'monthly',
+    'year': 'yearly', 'yr': 'yearly', 'annum': 'yearly', 'annually': 'yearly', 'yearly': 'yearly',
+}
+
+# annual pay outside this range is treated as an unrelated number (revenue, headcount, ...)
+PLAUSIBLE_ANNUAL = (10_000, 2_000_000)
+
+_CURRENCY = r'(?:[$£€]|\b(?:USD|GBP|EUR|CAD)\b)'
+_AMOUNT = r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?'
+_PER = r'(?:\s?(?:/|per|an?)\s?(?P<{0}>hour|hr|week|wk|month|mo|year|yr|annum)\b)'
+PAY_PATTERN = re.compile(
+    rf'(?P<currency>{_CURRENCY})\s?(?P<low>{_AMOUNT})(?:\s?(?P<low_k>[kK])\b)?{_PER.format("low_per")}?'
+    rf'(?:\s?(?:-|–|—|to)\s?{_CURRENCY}?\s?(?P<high>{_AMOUNT})(?:\s?(?P<high_k>[kK])\b)?)?'
+    r'(?P<scale>\s?(?:[mMbB]\b|million|billion))?'
+    rf'(?:{_PER.format("per")}|\s(?P<adverb>hourly|weekly|monthly|annually|yearly)\b)?',
+    re.IGNORECASE,
+)
+
+NO_COMPENSATION = 'No compensation info found'
+
+
+def _amount(number: str, k: Optional[str]) -> float:
+    value = float(number.replace(',', ''))
+    return value * 1000 if k else value
+
+
+def _from_match(match) -> Optional[dict]:
+    if match.group('scale'):
+        return None
+    low = _amount(match.group('low'), match.group('low_k'))
+    high = _amount(match.group('high'), match.group('high_k')) if match.group('high') else low
+    if high < low:
+        low, high = high, low
+    word = (match.group('per') or match.group('adverb') or match.group('low_per') or '').lower()
+    # without an explicit period small amounts are hourly rates
+    period = PERIOD_WORDS.get(word) or ('hourly' if high < 500 else 'yearly')
+    factor = ANNUAL_FACTORS[period]
+    if not PLAUSIBLE_ANNUAL[0] <= high * factor <= PLAUSIBLE_ANNUAL[1]:
+        return None
+    return {
+        'raw': match.group(0).strip(),
+        'min': low,
+        'max': high,
+        'currency': CURRENCIES[match.group('currency').lower()],
+        'period': period,
+        'annual_min': round(low * factor, 2),
+        'annual_max': round(high * factor, 2),
+    }
+
+
+def parse_compensation(text: str) -> Optional[dict]:
+    """
+    First plausible pay figure in `text`, preferring ranges over single amounts.
+
+    Returns:
+        dict: raw, min, max, currency, period (hourly/weekly/monthly/yearly),
+            annual_min and annual_max; None when no pay is mentioned.
+    """
+    if not text or not any(symbol in text for symbol in ('$', '£', '€', 'USD', 'GBP', 'EUR', 'CAD')):
+        return None
+    single = None
+    for match in PAY_PATTERN.finditer(text):
+        pay = _from_match(match)
+        if pay is None:
+            continue
+        if match.group('high'):
+            return pay
+        single = single or pay
+    return single
+
+
+def extract_compensation(texts: Iterable[Optional[str]]) -> Optional[dict]:
+    """Pay from the first of `texts` (salary/insight nodes, then the description) that mentions one."""
+    for text in texts:
+        pay = parse_compensation(text)
+        if pay is not None:
+            return pay
+    return None
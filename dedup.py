@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+MinHash + LSH near-duplicate detection over scraped postings, so
+reposts and the same role found by several searches are generated once
+"""
+import re
+from collections import defaultdict
+from typing import Dict, Hashable, List, Tuple
+
+import numpy as np
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+_SHINGLE_BASE = np.uint64(1000003)
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def job_text(job: dict) -> str:
+    """Text used for near-duplicate comparison: company, title and description."""
+    return f"{job.get('company', '')} {job.get('job_name', '')} {job.get('job_description', '')}"
+
+
+def shingle_hashes(text: str, size: int = 5) -> np.ndarray:
+    """
+    Unique 32-bit hashes of the word `size`-grams of a text, as a uint64 array.
+
+    Words are hashed once with the builtin str hash and combined into shingle
+    hashes with a vectorized polynomial roll instead of building every
+    shingle string. str hashes are salted per process, so signatures are only
+    comparable within one process and are never persisted.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter(map(hash, words), dtype=np.int64, count=len(words)).view(np.uint64) & _MASK32
+    size = min(size, len(words))
+    n = len(words) - size + 1
+    shingles = np.zeros(n, dtype=np.uint64)
+    for offset in range(size):
+        shingles = (shingles * _SHINGLE_BASE + word_hashes[offset:offset + n]) & _MASK32
+    return np.unique(shingles)
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose LSH S-curve midpoint
+    (1/b)**(1/r) is the highest one not above threshold, favouring recall;
+    false candidates are filtered out by the signature similarity check.
+    """
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    midpoint = lambda br: (1 / br[0]) ** (1 / br[1])
+    below = [br for br in options if midpoint(br) <= threshold]
+    if not below:
+        return min(options, key=midpoint)
+    return max(below, key=midpoint)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures bucketed by LSH bands.
+
+    Signatures for all shingles of a document are computed in one NumPy
+    broadcast, and candidate pairs only come from shared band buckets, so
+    building and querying the index stays sub-quadratic. Candidates are
+    confirmed by their estimated Jaccard similarity before clustering.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        # multiply-shift hash family: h(x) = (a * x + b) >> 32 with odd 64-bit a, wrapping in uint64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text (num_perm uint32 values)."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not hashes.size:
+            return np.full(self.num_perm, _MASK32, dtype=np.uint64)
+        permuted = (np.multiply.outer(hashes, self._a) + self._b) >> _SHIFT32
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: Hashable, text: str):
+        signature = self.signature(text)
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket[band_key].append(key)
+
+    def query(self, text: str) -> List[Hashable]:
+        """Keys already in the index whose estimated similarity to `text` is at least the threshold."""
+        return self._matches(self.signature(text))
+
+    def _matches(self, signature: np.ndarray, exclude: Hashable = None) -> List[Hashable]:
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+        candidates.discard(exclude)
+        return [key for key in candidates
+                if np.mean(self.signatures[key] == signature) >= self.threshold]
+
+    def clusters(self) -> List[List[Hashable]]:
+        """Group indexed keys into near-duplicate clusters (union-find over confirmed candidate pairs)."""
+        parent = {key: key for key in self.signatures}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key, signature in self.signatures.items():
+            for other in self._matches(signature, exclude=key):
+                root_a, root_b = find(key), find(other)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+        groups = defaultdict(list)
+        for key in self.signatures:
+            groups[find(key)].append(key)
+        return list(groups.values())
+
+
+def representatives(jobs: List[dict], threshold: float = 0.8) -> List[int]:
+    """
+    For each job, the index of the job that represents its near-duplicate
+    cluster (the earliest one), so callers can generate once per cluster.
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    for i, job in enumerate(jobs):
+        index.add(i, job_text(job))
+    rep = list(range(len(jobs)))
+    for cluster in index.clusters():
+        first = min(cluster)
+        for i in cluster:
+            rep[i] = first
+    return rep
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+parse resume and cover letter .docx files once into text plus named
+sections, cached on disk by path, mtime and content hash
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+# bump when the parsed output changes so stale cache entries are re-parsed
+PARSER_VERSION = 2
+
+# canonical section names and the heading words that map to them
+SECTION_ALIASES = {
+    'summary': ('summary', 'profile', 'objective', 'about'),
+    'experience': ('experience', 'employment', 'work history', 'career'),
+    'skills': ('skill', 'competenc', 'technolog', 'tools', 'expertise'),
+    'education': ('education', 'academic', 'certification', 'degree'),
+}
+
+# whole lines recognised as section headings without a heading style,
+# e.g. when a resume uses plain bold text for them
+PLAIN_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'professional profile',
+                'objective', 'career objective', 'about', 'about me'),
+    'experience': ('experience', 'work experience', 'professional experience', 'relevant experience',
+                   'employment', 'employment history', 'work history', 'career history'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core skills', 'skills and tools',
+               'competencies', 'core competencies', 'technologies', 'tools', 'expertise', 'areas of expertise'),
+    'education': ('education', 'academic background', 'certifications', 'education and certifications',
+                  'licenses and certifications', 'degrees'),
+}
+_PLAIN_HEADINGS = {heading: name for name, headings in PLAIN_HEADINGS.items() for heading in headings}
+
+_HEADING_STYLES = re.compile(r'^(heading|title)', re.IGNORECASE)
+_LIST_STYLES = re.compile(r'^list', re.IGNORECASE)
+
+# documents parsed in this process, keyed by (path, mtime_ns, size)
+_memory_cache: Dict[tuple, 'ParsedDocument'] = {}
+
+
+def canonical_section(heading: str) -> str:
+    """Map a heading to one of SECTION_ALIASES, or its own lowercased text."""
+    lowered = heading.strip().lower()
+    for name, aliases in SECTION_ALIASES.items():
+        if any(alias in lowered for alias in aliases):
+            return name
+    return lowered
+
+
+def plain_heading(line: str) -> Optional[str]:
+    """Section name when the whole line is a known heading ("Work Experience:"), else None."""
+    normalized = ' '.join(line.lower().replace('&', ' and ').rstrip(' :').split())
+    return _PLAIN_HEADINGS.get(normalized)
+
+
+class ParsedDocument:
+    """
+    Text of a .docx in body order (paragraphs, bullets as "- " lines, table
+    rows as " | " joined cells) followed by page header text, plus the same
+    lines grouped by heading into `sections`.
+    """
+
+    def __init__(self, lines: List[str], sections: Dict[str, List[str]], headers: List[str]):
+        self.lines = lines
+        self.sections = sections
+        self.headers = headers
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.headers + self.lines) + '\n'
+
+    def section(self, name: str) -> str:
+        return '\n'.join(self.sections.get(name, []))
+
+    def select(self, names: Optional[Iterable[str]] = None) -> str:
+        """Text of the named sections only, in document order; all text when `names` is empty."""
+        if not names:
+            return self.text
+        wanted = set(names)
+        parts = [f"{name.title()}\n" + '\n'.join(lines)
+                 for name, lines in self.sections.items() if name in wanted]
+        return '\n\n'.join(parts) + '\n'
+
+    def to_dict(self) -> dict:
+        return {'lines': self.lines, 'sections': self.sections, 'headers': self.headers}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ParsedDocument':
+        return cls(data['lines'], data['sections'], data['headers'])
+
+
+def _table_lines(table: Table) -> List[str]:
+    lines = []
+    for row in table.rows:
+        cells = []
+        for cell in row.cells:
+            # merged cells are repeated once per grid column
+            text = cell.text.strip()
+            if text and (not cells or cells[-1] != text):
+                cells.append(text)
+        if cells:
+            lines.append(' | '.join(cells))
+    return lines
+
+
+def _block_lines(container, parent) -> Iterable[tuple]:
+    """(is_heading, line) pairs for the paragraphs and tables of a body, header or cell, in order."""
+    for child in container.iterchildren():
+        tag = child.tag.rsplit('}', 1)[-1]
+        if tag == 'p':
+            paragraph = Paragraph(child, parent)
+            text = paragraph.text.strip()
+            if not text:
+                continue
+            style = paragraph.style.name if paragraph.style is not None else ''
+            if _HEADING_STYLES.match(style):
+                yield True, text
+            elif _LIST_STYLES.match(style) or child.pPr is not None and child.pPr.numPr is not None:
+                yield False, f"- {text}"
+            else:
+                yield False, text
+        elif tag == 'tbl':
+            for line in _table_lines(Table(child, parent)):
+                yield False, line
+
+
+def parse_docx(file_path) -> ParsedDocument:
+    """Parse a .docx into a ParsedDocument (no caching)."""
+    doc = Document(file_path)
+    lines, sections = [], {}
+    current = 'header'
+    for is_heading, line in _block_lines(doc.element.body, doc._body):
+        lines.append(line)
+        # a line that is only a heading ("Skills", "Work Experience:") just starts its section
+        name = plain_heading(line)
+        if name is not None:
+            current = name
+            continue
+        # other Heading/Title styled lines ("Technical Skills & Tools", a name in
+        # Title style) start a section but their text is kept in it
+        if is_heading:
+            current = canonical_section(line)
+        sections.setdefault(current, []).append(line)
+
+    headers, seen = [], set()
+    for section in doc.sections:
+        if section.header.is_linked_to_previous:
+            continue
+        for _, line in _block_lines(section.header._element, section.header):
+            if line not in seen:
+                seen.add(line)
+                headers.append(line)
+    return ParsedDocument(lines, sections, headers)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_document(file_path, cache_dir: Optional[str] = '.docx_cache') -> ParsedDocument:
+    """
+    Parsed document for `file_path`, parsing the .docx only when it changed.
+
+    Lookups go through an in-process cache keyed by path, mtime and size,
+    then the on-disk cache entry for the path: a matching mtime and size is
+    trusted, otherwise the content hash decides, so a touched but unchanged
+    file is not re-parsed.
+
+    Args:
+        file_path: path to the .docx file.
+        cache_dir (str): directory for parsed documents; None disables the disk cache.
+
+    Returns:
+        ParsedDocument: the parsed text and sections.
+    """
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    memory_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if memory_key in _memory_cache:
+        return _memory_cache[memory_key]
+
+    entry_path = None
+    entry = None
+    if cache_dir is not None:
+        entry_path = Path(cache_dir) / f"{hashlib.sha256(str(path).encode('utf-8')).hexdigest()[:32]}.json"
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        if entry is not None and entry.get('version') != PARSER_VERSION:
+            entry = None
+
+    sha256 = None
+    if entry is not None and (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+        document = ParsedDocument.from_dict(entry['document'])
+    else:
+        sha256 = _file_sha256(path)
+        if entry is not None and entry['sha256'] == sha256:
+            document = ParsedDocument.from_dict(entry['document'])
+        else:
+            document = parse_docx(path)
+
+    if entry_path is not None and sha256 is not None:
+        # record the new mtime (and document, if re-parsed) for the next run
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': PARSER_VERSION, 'path': str(path), 'mtime_ns': stat.st_mtime_ns,
+                       'size': stat.st_size, 'sha256': sha256, 'document': document.to_dict()}, f)
+        os.replace(tmp_path, entry_path)
+
+    _memory_cache[memory_key] = document
+    return document
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+persistent crawl frontier: search and job-detail tasks in a SQLite (WAL)
+queue with leases, retries and canonical-url dedup, so several worker
+processes (or hosts sharing the file) can crawl many locations x titles
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from typing import Iterable, List, Optional
+
+import app_config
+from http_cache import normalize_url
+from job_index import canonical_job_url, job_id_from_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    dedup_key TEXT NOT NULL UNIQUE,
+    payload TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks(status, available_at, priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(status, lease_expires);
+"""
+
+TASK_KINDS = ('search', 'job')
+
+# job pages are claimed before more search pages so the frontier drains instead of growing
+PRIORITIES = {'search': 0, 'job': 10}
+
+# shortest wait, in seconds, between claims while a worker has nothing to do
+IDLE_POLL_MIN = 0.05
+
+
+def dedup_key(kind: str, url: str, crawl: str = None) -> str:
+    """
+    Jobs dedup on their numeric id for good. Searches dedup on the
+    normalized url within one crawl, so the same search is queued again
+    by the next crawl (e.g. tomorrow's) but only once per crawl.
+    """
+    if kind == 'job':
+        job_id = job_id_from_url(url)
+        if job_id is not None:
+            return f"job:{job_id}"
+    if kind == 'search' and crawl:
+        return f"search:{crawl}:{normalize_url(url)}"
+    return f"{kind}:{normalize_url(url)}"
+
+
+def default_crawl_id() -> str:
+    """One crawl per day unless a crawl id is given."""
+    return time.strftime('%Y-%m-%d')
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class Frontier:
+    """
+    Task queue in SQLite.
+
+    Claims run in a BEGIN IMMEDIATE transaction, which takes the database
+    write lock, so two workers can never lease the same task. A lease
+    records its owner and expiry; expired leases are returned to pending on
+    the next claim, so a crashed worker's tasks are picked up again until
+    they have used max_attempts.
+    Completing or failing a task only succeeds for the current lease owner.
+    """
+
+    def __init__(self, path: str = 'frontier.sqlite', lease_seconds: float = 300, max_attempts: int = 3,
+                 retry_backoff: float = 60):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        # autocommit mode, transactions are opened explicitly
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA busy_timeout=30000')
+        self.conn.executescript(SCHEMA)
+
+    def add(self, tasks: Iterable[tuple]) -> int:
+        """
+        Queue (kind, url, payload) tasks, skipping any already queued or done.
+        Search tasks are deduplicated within the `crawl` named in their payload.
+
+        Returns:
+            int: number of new tasks.
+        """
+        now = time.time()
+        rows = []
+        for kind, url, payload in tasks:
+            if kind not in TASK_KINDS:
+                raise ValueError(f"Unknown task kind: {kind}")
+            if kind == 'job':
+                url = canonical_job_url(url)
+            payload = payload or {}
+            rows.append((kind, url, dedup_key(kind, url, payload.get('crawl')), json.dumps(payload), PRIORITIES[kind], now, now, now))
+        before = self.conn.total_changes
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self.conn.executemany("""
+                INSERT OR IGNORE INTO tasks (kind, url, dedup_key, payload, priority, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return self.conn.total_changes - before
+
+    def _reclaim(self, now: float) -> int:
+        # a task whose worker keeps dying (e.g. a page that crashes the parser)
+        # uses up its attempts like any other failure instead of cycling forever
+        cursor = self.conn.execute("""
+            UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                             lease_owner = NULL, lease_expires = NULL, updated_at = ?,
+                             last_error = 'lease expired'
+            WHERE status = 'leased' AND lease_expires < ?
+        """, (self.max_attempts, now, now))
+        return cursor.rowcount
+
+    def reclaim_expired(self) -> int:
+        """
+        Return tasks whose lease ran out to pending, or mark them failed once
+        they have used max_attempts; returns how many leases were reclaimed.
+        """
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            n = self._reclaim(time.time())
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return n
+
+    def claim(self, worker_id: str, limit: int = 1, kinds: Iterable[str] = TASK_KINDS) -> List[dict]:
+        """
+        Lease up to `limit` runnable tasks to `worker_id`, highest priority first.
+
+        Returns:
+            List[dict]: the leased tasks with their payload decoded.
+        """
+        now = time.time()
+        kinds = tuple(kinds)
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._reclaim(now)
+            rows = self.conn.execute(f"""
+                UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                                 attempts = attempts + 1, updated_at = ?
+                WHERE id IN (
+                    SELECT id FROM tasks
+                    WHERE status = 'pending' AND available_at <= ? AND kind IN ({', '.join('?' * len(kinds))})
+                    ORDER BY priority DESC, id
+                    LIMIT ?
+                )
+                RETURNING id, kind, url, payload, attempts
+            """, (worker_id, now + self.lease_seconds, now, now, *kinds, limit)).fetchall()
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return [dict(row, payload=json.loads(row['payload'])) for row in rows]
+
+    def _finish(self, sql: str, params: tuple) -> bool:
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = self.conn.execute(sql, params)
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+
+    def extend(self, task_id: int, worker_id: str) -> bool:
+        """Renew a lease for long running work; False if the lease was lost."""
+        now = time.time()
+        return self._finish("""
+            UPDATE tasks SET lease_expires = ?, updated_at = ?
+            WHERE id = ? AND status = 'leased' AND lease_owner = ?
+        """, (now + self.lease_seconds, now, task_id, worker_id))
+
+    def complete(self, task_id: int, worker_id: str) -> bool:
+        """Mark a leased task done; False if the lease expired and was handed to another worker."""
+        return self._finish("""
+            UPDATE tasks SET status = 'done', lease_owner = NULL, lease_expires = NULL, last_error = NULL,
+                             updated_at = ?
+            WHERE id = ? AND status = 'leased' AND lease_owner = ?
+        """, (time.time(), task_id, worker_id))
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt: the task is retried after an exponential
+        backoff, or marked failed once it has used max_attempts.
+        """
+        now = time.time()
+        return self._finish("""
+            UPDATE tasks SET
+                status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                available_at = ? + ? * (1 << (attempts - 1)),
+                lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ?
+            WHERE id = ? AND status = 'leased' AND lease_owner = ?
+        """, (self.max_attempts, now, self.retry_backoff, str(error)[:500], now, task_id, worker_id))
+
+    def counts(self) -> dict:
+        """Task counts as {kind: {status: n}}."""
+        counts = {}
+        for row in self.conn.execute('SELECT kind, status, COUNT(*) AS n FROM tasks GROUP BY kind, status'):
+            counts.setdefault(row['kind'], {})[row['status']] = row['n']
+        return counts
+
+    def open_tasks(self) -> int:
+        """Tasks that still need work (pending or leased)."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def next_available(self) -> Optional[float]:
+        """Earliest time a pending task or current lease becomes claimable."""
+        row = self.conn.execute("""
+            SELECT MIN(CASE WHEN status = 'pending' THEN available_at ELSE lease_expires END)
+            FROM tasks WHERE status IN ('pending', 'leased')
+        """).fetchone()
+        return row[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def frontier_from_config(config: dict) -> Frontier:
+    """Open the Frontier described by the `frontier` section of the config."""
+    settings = config.get('frontier') or {}
+    return Frontier(
+        settings.get('path', 'frontier.sqlite'),
+        lease_seconds=settings.get('lease_seconds', 300),
+        max_attempts=settings.get('max_attempts', 3),
+        retry_backoff=settings.get('retry_backoff', 60),
+    )
+
+
+def search_config(config: dict, location: str) -> dict:
+    """Copy of the config searching `location`."""
+    return {**config, 'job_search': {**config['job_search'], 'location': location}}
+
+
+def seed_searches(frontier: Frontier, config: dict, crawl: str = None) -> int:
+    """
+    Queue the first results page of every location x job title in the config.
+
+    Args:
+        frontier (Frontier): queue to seed.
+        config (dict): parsed config2.yaml.
+        crawl (str): crawl id the searches belong to, defaults to today's date.
+            Seeding the same crawl twice queues nothing new.
+
+    Returns:
+        int: number of search tasks queued.
+    """
+    from linkedin_job_scraper import build_search_url
+
+    crawl = crawl or default_crawl_id()
+    job_search = config['job_search']
+    locations = job_search.get('locations') or [job_search['location']]
+    tasks = []
+    for location in locations:
+        for title in job_search['job_titles']:
+            url = build_search_url(search_config(config, location), title, 0)
+            tasks.append(('search', url, {'location': location, 'job_title': title, 'page': 0, 'crawl': crawl}))
+    return frontier.add(tasks)
+
+
+class FrontierWorker:
+    """
+    Claims tasks and runs them with the normal scraper client: a search task
+    queues the job links on its page plus the next page, a job task extracts
+    the posting into the shared JobStore and seen-jobs index.
+
+    Workers share one per-host rate budget kept in the frontier file, since
+    they share one egress ip; a worker only takes tokens while it has work.
+    """
+
+    def __init__(self, config: dict, worker_id: str = None):
+        from html_parsing import DEFAULT_BACKEND
+        from http_cache import cache_from_config
+        from http_client import client_from_config
+        from job_index import SeenJobsIndex
+        from job_store import JobStore
+        from rate_limit import limiter_from_config
+
+        self.config = config
+        settings = config.get('frontier') or {}
+        self.worker_id = worker_id or default_worker_id()
+        self.claim_batch = settings.get('claim_batch', 5)
+        self.poll_seconds = settings.get('poll_seconds', 5)
+        self.frontier = frontier_from_config(config)
+        self.limiter = limiter_from_config(config, shared_path=self.frontier.path)
+        self.client = client_from_config(config, self.limiter, cache_from_config(config))
+        self.store = JobStore((config.get('job_store') or {}).get('path') or 'jobs.sqlite')
+        self.index = SeenJobsIndex(config['job_search'].get('index_path', 'seen_jobs.sqlite'))
+        self.parser = (config.get('scraper') or {}).get('parser', DEFAULT_BACKEND)
+        self.processed = 0
+
+    def run_search(self, task: dict):
+        from linkedin_job_scraper import build_search_url, fetch_page, job_links_from_page, RESULTS_PER_PAGE
+
+        payload = task['payload']
+        soup = fetch_page(task['url'], self.client)
+        if soup is None:
+            raise RuntimeError('search page could not be fetched')
+        links = job_links_from_page(soup)
+        self.index.record_seen([url for _, url in links])
+        tasks = [('job', url, {'location': payload.get('location'), 'job_title': payload.get('job_title')})
+                 for _, url in links]
+        # an empty page means we ran past the last page of results
+        page = payload.get('page', 0) + 1
+        if links and page < self.config['job_search'].get('max_pages', 5):
+            config = search_config(self.config, payload['location'])
+            tasks.append(('search', build_search_url(config, payload['job_title'], page * RESULTS_PER_PAGE),
+                          {**payload, 'page': page}))
+        self.frontier.add(tasks)
+
+    def run_job(self, task: dict):
+        from linkedin_job_scraper import extract_job_details
+
+        details = extract_job_details(task['url'], self.client, self.parser)
+        if details['job_name'] == 'Failed to fetch':
+            raise RuntimeError('job page could not be fetched')
+        self.store.upsert_jobs([details])
+        self.index.mark_extracted([task['url']])
+
+    def run(self, max_tasks: int = None, wait: bool = True) -> int:
+        """
+        Work until the frontier is drained (or `max_tasks` are done).
+
+        Args:
+            max_tasks (int): stop after this many tasks.
+            wait (bool): when only other workers' leases or delayed retries
+                remain, wait for them instead of exiting.
+
+        Returns:
+            int: tasks processed by this worker.
+        """
+        # idle polls back off from IDLE_POLL_MIN to poll_seconds, so a worker
+        # picks up tasks queued by a busy one quickly without spinning
+        idle_wait = IDLE_POLL_MIN
+        try:
+            while max_tasks is None or self.processed < max_tasks:
+                batch = self.frontier.claim(self.worker_id, self.claim_batch)
+                if not batch:
+                    next_at = self.frontier.next_available()
+                    if next_at is None or not wait:
+                        break
+                    time.sleep(min(max(next_at - time.time(), IDLE_POLL_MIN), idle_wait))
+                    idle_wait = min(idle_wait * 2, self.poll_seconds)
+                    continue
+                idle_wait = IDLE_POLL_MIN
+                for task in batch:
+                    try:
+                        (self.run_search if task['kind'] == 'search' else self.run_job)(task)
+                    except Exception as e:
+                        print(f"[{self.worker_id}] {task['kind']} task {task['url']} failed: {e}")
+                        self.frontier.fail(task['id'], self.worker_id, e)
+                    else:
+                        if not self.frontier.complete(task['id'], self.worker_id):
+                            print(f"[{self.worker_id}] lease on {task['url']} expired before completion")
+                    self.processed += 1
+        finally:
+            self.close()
+        return self.processed
+
+    def close(self):
+        self.frontier.close()
+        self.store.close()
+        self.index.close()
+        self.client.close()
+        self.limiter.close()
+
+
+def _worker_main(config: dict, max_tasks: int = None):
+    worker = FrontierWorker(config)
+    print(f"[{worker.worker_id}] processed {worker.run(max_tasks)} tasks")
+
+
+def run_workers(config: dict, workers: int = None, max_tasks: int = None):
+    """
+    Run `workers` worker processes against the frontier and wait for them to
+    drain it. The workers draw from one shared per-host request rate, which
+    starts again from the configured rate on every call.
+    """
+    from rate_limit import SharedHostRateLimiter
+
+    settings = config.get('frontier') or {}
+    workers = workers or settings.get('workers', 2)
+    limiter = SharedHostRateLimiter(settings.get('path', 'frontier.sqlite'), 1)
+    limiter.reset()
+    limiter.close()
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_worker_main, args=(config, max_tasks))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def build_parser(prog: str = None, with_config: bool = True) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=prog, description='Distributed crawl frontier for the LinkedIn scraper.')
+    if with_config:
+        parser.add_argument('--config', help=f'config file (default: ${app_config.CONFIG_ENV} or config2.yaml)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    seed = commands.add_parser('seed', help='queue a search for every location x job title')
+    seed.add_argument('--crawl', default=None, help='crawl id (default: today, so reseeding the same day is a no-op)')
+    work = commands.add_parser('work', help='run worker processes until the frontier is drained')
+    work.add_argument('--workers', type=int, default=None)
+    work.add_argument('--max-tasks', type=int, default=None, help='per worker')
+    commands.add_parser('stats', help='task counts by kind and status')
+    commands.add_parser('reclaim', help='return expired leases to pending')
+    return parser
+
+
+def run_command(args, config: dict):
+    """Run a parsed seed/work/stats/reclaim command against the configured frontier."""
+    if args.command == 'work':
+        run_workers(config, args.workers, args.max_tasks)
+        return
+
+    frontier = frontier_from_config(config)
+    try:
+        if args.command == 'seed':
+            print(f"Queued {seed_searches(frontier, config, args.crawl)} search tasks")
+        elif args.command == 'reclaim':
+            print(f"Reclaimed {frontier.reclaim_expired()} expired leases")
+        print(json.dumps(frontier.counts(), indent=2))
+    finally:
+        frontier.close()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    run_command(args, app_config.load_config(args.config))
+
+
+if __name__ == '__main__':
+    main()
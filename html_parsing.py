@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+job page parsing: pluggable HTML parser backends and
+single-pass extraction of the job detail fields
+"""
+import re
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
+
+from compensation import NO_COMPENSATION, extract_compensation
+
+TITLE_SELECTORS = ['h1', '.top-card-layout__title', '.job-details-jobs-unified-top-card__job-title', 'title']
+COMPANY_SELECTORS = [
+    '.job-details-jobs-unified-top-card__company-name',
+    '.jobs-unified-top-card__company-name',
+    '.top-card-layout__second-subline',
+    '.job-details-jobs-unified-top-card__primary-description-container a',
+    'a[data-tracking-control-name="job_details_topcard_company_url"]'
+]
+DESCRIPTION_SELECTORS = ['.show-more-less-html__markup', '.jobs-description__content', '.job-description']
+# salary and top-card insight nodes, checked for pay before the description
+COMPENSATION_SELECTORS = [
+    '.compensation__salary',
+    '.salary',
+    '.job-details-jobs-unified-top-card__job-insight',
+    '.job-details-preferences-and-skills'
+]
+JOB_KEYWORDS = ['responsibilities', 'requirements', 'experience',
+                'skills', 'qualifications', 'position', 'role', 'duties']
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+# selectolax (lexbor) parses and selects in C; html.parser is the fallback
+DEFAULT_BACKEND = 'selectolax'
+
+_COMPOUND = re.compile(r'^(?P<tag>[a-z0-9]+)?(?P<classes>(?:\.[\w-]+)*)(?:\[(?P<attr>[\w-]+)="(?P<value>[^"]*)"\])?$')
+
+
+class CompiledSelector:
+    """
+    The small subset of CSS the job selectors use, compiled once:
+    `tag`, `.class`, `tag[attr="value"]` and a single descendant combinator.
+    """
+
+    def __init__(self, css: str):
+        self.css = css
+        parts = css.split()
+        if len(parts) > 2:
+            raise ValueError(f"Unsupported selector: {css}")
+        self.ancestor = self._compile(parts[0]) if len(parts) == 2 else None
+        self.compound = self._compile(parts[-1])
+
+    @staticmethod
+    def _compile(compound: str):
+        match = _COMPOUND.match(compound)
+        if not match:
+            raise ValueError(f"Unsupported selector: {compound}")
+        classes = [c for c in match.group('classes').split('.') if c]
+        attr = (match.group('attr'), match.group('value')) if match.group('attr') else None
+        return match.group('tag'), classes, attr
+
+    @staticmethod
+    def _matches_compound(element: Tag, compound) -> bool:
+        tag, classes, attr = compound
+        if tag and element.name != tag:
+            return False
+        if classes:
+            element_classes = element.get('class') or ()
+            if not all(c in element_classes for c in classes):
+                return False
+        if attr and element.get(attr[0]) != attr[1]:
+            return False
+        return True
+
+    def matches(self, element: Tag) -> bool:
+        if not self._matches_compound(element, self.compound):
+            return False
+        if self.ancestor is None:
+            return True
+        return any(self._matches_compound(parent, self.ancestor) for parent in element.parents
+                   if isinstance(parent, Tag) and parent.name != '[document]')
+
+
+_ALL_SELECTORS = list(dict.fromkeys(TITLE_SELECTORS + COMPANY_SELECTORS + DESCRIPTION_SELECTORS
+                                    + COMPENSATION_SELECTORS))
+_COMPILED = [CompiledSelector(css) for css in _ALL_SELECTORS]
+
+
+class SoupDocument:
+    """
+    BeautifulSoup-backed document (html.parser or lxml tree builder).
+
+    One walk over the tree records the first element matching each
+    selector, which is what soup.select_one would return, plus the
+    outermost div/section elements for the description fallback.
+    """
+
+    def __init__(self, content: bytes, features: str = 'html.parser'):
+        self.soup = BeautifulSoup(content, features)
+        self._first = {}
+        self._outer_blocks = []
+
+        pending = list(_COMPILED)
+        for element in self.soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            if pending:
+                for selector in [s for s in pending if s.matches(element)]:
+                    self._first[selector.css] = element
+                    pending.remove(selector)
+            if element.name in ('div', 'section') and element.find_parent(('div', 'section')) is None:
+                self._outer_blocks.append(element)
+
+    def first_text(self, css: str):
+        """Stripped text of the first element matching `css`, or None when nothing matches."""
+        element = self._first.get(css)
+        return element.get_text(strip=True) if element is not None else None
+
+    def block_texts(self):
+        """
+        Stripped text of candidate div/section blocks, in document order.
+
+        A nested block's text is a substring of its outermost block's text,
+        so if the outermost block fails the length/keyword test none of its
+        descendants can pass; only outermost blocks need checking.
+        """
+        for element in self._outer_blocks:
+            yield element.get_text(strip=True)
+
+
+class SelectolaxDocument:
+    """
+    selectolax (lexbor) backed document; selectors run in C against the parsed tree.
+    Text of script/style content can differ slightly from BeautifulSoup.
+    """
+
+    def __init__(self, content: bytes):
+        from selectolax.lexbor import LexborHTMLParser
+        self.tree = LexborHTMLParser(content)
+
+    def first_text(self, css: str):
+        node = self.tree.css_first(css)
+        return node.text(strip=True) if node is not None else None
+
+    def block_texts(self):
+        for node in self.tree.css('div, section'):
+            parent = node.parent
+            while parent is not None and parent.tag not in ('div', 'section'):
+                parent = parent.parent
+            if parent is None:
+                yield node.text(strip=True)
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(backend: str) -> str:
+    """
+    The backend to parse with: `backend` itself, or html.parser when the
+    lxml/selectolax package behind it is not installed (reported once).
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    try:
+        if backend == 'selectolax':
+            import selectolax.lexbor  # noqa: F401
+        elif backend == 'lxml':
+            BeautifulSoup('', 'lxml')
+    except (ImportError, FeatureNotFound):
+        print(f"{backend} is not installed, falling back to html.parser")
+        return 'html.parser'
+    return backend
+
+
+def make_document(content: bytes, backend: str = DEFAULT_BACKEND):
+    """Parse a page with the requested backend (see resolve_backend for the fallback)."""
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        return SelectolaxDocument(content)
+    return SoupDocument(content, backend)
+
+
+def parse_job_details(job_url: str, content: bytes, backend: str = DEFAULT_BACKEND) -> dict:
+    """
+    Extract the job detail fields from the raw bytes of a job page.
+
+    Args:
+        job_url (str): url the page was fetched from, used for the company fallback.
+        content (bytes): raw page body.
+        backend (str): one of PARSER_BACKENDS.
+
+    Returns:
+        dict: job_url, job_name, company, job_description, additional_info (the raw
+            pay text) and compensation (structured pay fields or None).
+    """
+    doc = make_document(content, backend)
+
+    # Extract job title/name
+    job_name = ""
+    for selector in TITLE_SELECTORS:
+        text = doc.first_text(selector)
+        # Clean up common prefixes/suffixes and take relevant part
+        if text is not None and len(text) > 5 and 'linkedin' not in text.lower():
+            job_name = text.split('|')[0].split('-')[0].strip()  # Take first part before separators
+            break
+
+    # Extract company name
+    company = ""
+    for selector in COMPANY_SELECTORS:
+        text = doc.first_text(selector)
+        if text is not None and len(text) > 1 and 'linkedin' not in text.lower():
+            # Clean up company name - remove location and other metadata
+            company = text.split('Charlotte, NC')[0].split(' ago')[0].split(' applicants')[0].strip()
+            if company:
+                break
+
+    # If no company found in selectors, try to extract from URL pattern
+    if not company and '-at-' in job_url:
+        company_part = job_url.split('-at-')[1].split('-')[0]
+        company = company_part.replace('-', ' ').title()
+
+    # Try common job description selectors first
+    description = ""
+    for selector in DESCRIPTION_SELECTORS:
+        text = doc.first_text(selector)
+        if text is not None:
+            description = text
+            break
+
+    # Fallback: find text containing job-related keywords
+    if not description:
+        for text in doc.block_texts():
+            lowered = text.lower()
+            if len(text) > 300 and any(keyword in lowered for keyword in JOB_KEYWORDS):
+                description = text
+                break
+
+    # company boilerplate is learned across the scraped corpus and stripped
+    # before prompting, see boilerplate.BoilerplateDetector
+
+    # Extract compensation from the salary/insight nodes, then the description
+    compensation = extract_compensation(
+        [doc.first_text(selector) for selector in COMPENSATION_SELECTORS] + [description])
+
+    return {
+        'job_url': job_url,
+        'job_name': job_name or 'No title found',
+        'company': company or 'No company found',
+        'job_description': description or 'No description found',
+        'additional_info': compensation['raw'] if compensation else NO_COMPENSATION,
+        'compensation': compensation
+    }
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+persistent on-disk cache of fetched pages so reruns
+do not refetch search and job pages from LinkedIn
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# query params that change per impression but not the page content
+TRACKING_PARAMS = {'refid', 'trackingid', 'position', 'pagenum', 'trk', 'trkinfo', 'lipi', 'ebp', 'original_referer'}
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme/host, drop fragments and tracking params, and sort the remaining query."""
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/') or '/', urlencode(query), ''))
+
+
+def classify_url(url: str) -> str:
+    """Return the TTL class of a url: 'job' for posting pages, 'search' for everything else."""
+    return 'job' if '/jobs/view/' in urlsplit(url).path else 'search'
+
+
+class CacheEntry:
+    """A cached response body and its metadata."""
+
+    def __init__(self, content: bytes, meta: dict, fresh: bool):
+        self.content = content
+        self.meta = meta
+        self.fresh = fresh
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.meta.get('etag'):
+            headers['If-None-Match'] = self.meta['etag']
+        if self.meta.get('last_modified'):
+            headers['If-Modified-Since'] = self.meta['last_modified']
+        return headers
+
+
+class ResponseCache:
+    """
+    Disk cache keyed by the sha256 of the normalized url.
+
+    Each entry is one file holding a JSON metadata line followed by the
+    zlib-compressed body. File mtimes track last access, and the least
+    recently used entries are evicted once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = '.http_cache', max_bytes: int = 500 * 1024 * 1024,
+                 ttls: dict = None, mode: str = 'normal'):
+        if mode not in ('normal', 'replay', 'off'):
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttls = {'search': 3600, 'job': 30 * 24 * 3600}
+        self.ttls.update(ttls or {})
+        self.mode = mode
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = sum(path.stat().st_size for path in self.cache_dir.glob('*/*.cache'))
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == 'replay'
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.cache"
+
+    def get(self, url: str):
+        """
+        Look up a url.
+
+        Returns:
+            CacheEntry: the cached entry (fresh or stale), or None on a miss.
+        """
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                content = zlib.decompress(f.read())
+            os.utime(path)
+        except (OSError, ValueError, zlib.error):
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        ttl = self.ttls.get(meta.get('kind'), self.ttls['search'])
+        fresh = self.replay or time.time() - meta['fetched_at'] < ttl
+        with self._lock:
+            self.stats['hits' if fresh else 'misses'] += 1
+        return CacheEntry(content, meta, fresh)
+
+    def put(self, url: str, content: bytes, headers: dict = None):
+        """Store a response body along with its validators."""
+        headers = headers or {}
+        meta = {
+            'url': normalize_url(url),
+            'kind': classify_url(url),
+            'fetched_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+        self._write(url, meta, zlib.compress(content, 6))
+        with self._lock:
+            self.stats['stored'] += 1
+
+    def touch(self, url: str, entry: CacheEntry):
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        meta = dict(entry.meta, fetched_at=time.time())
+        self._write(url, meta, zlib.compress(entry.content, 6))
+        with self._lock:
+            self.stats['revalidated'] += 1
+
+    def _write(self, url: str, meta: dict, body: bytes):
+        path = self._path(url)
+        path.parent.mkdir(exist_ok=True)
+        old_size = path.stat().st_size if path.exists() else 0
+        # thread ids repeat across processes (frontier workers, parse pool) sharing the cache
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(json.dumps(meta).encode('utf-8') + b'\n')
+            f.write(body)
+        os.replace(tmp, path)
+        with self._lock:
+            self._size += path.stat().st_size - old_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache is under 90% of max_bytes."""
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob('*/*.cache'):
+                # another process sharing the cache may evict the same file first
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            target = self.max_bytes * 0.9
+            for _, size, path in entries:
+                if self._size <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                self._size -= size
+                self.stats['evicted'] += 1
+
+
+def cache_from_config(config: dict):
+    """Build a ResponseCache from the `cache` section of the config, or None if caching is off."""
+    cache = config.get('cache') or {}
+    mode = cache.get('mode', 'normal')
+    if mode == 'off':
+        return None
+    return ResponseCache(
+        cache_dir=cache.get('dir', '.http_cache'),
+        max_bytes=int(cache.get('max_mb', 500) * 1024 * 1024),
+        ttls=cache.get('ttl_seconds'),
+        mode=mode,
+    )
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+pooled HTTP client used by the scraper: one requests.Session,
+a user agent pool built once, retries with backoff and AIMD throttling
+"""
+import random
+import threading
+import time
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from http_cache import ResponseCache, classify_url
+from rate_limit import HostRateLimiter
+
+# status codes that mean "slow down" (999 is LinkedIn's bot block)
+THROTTLE_STATUSES = {429, 999}
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 503, 504}
+
+BASE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+@lru_cache(maxsize=1)
+def user_agent_pool():
+    """Load the fake_useragent browser dataset once per process, on first use."""
+    from fake_useragent import UserAgent
+    return UserAgent()
+
+
+class ScraperClient:
+    """
+    Reusable HTTP client that keeps connections alive between requests.
+
+    fetch() serves pages from the optional disk cache and only takes a
+    token from `limiter` when it has to go to the network. The per-host rate
+    is adjusted additively up on healthy responses and multiplicatively
+    down on 429/999 or slow responses.
+    """
+
+    def __init__(self, limiter: HostRateLimiter = None, cache: ResponseCache = None,
+                 pool_size: int = 10, timeout: float = 10,
+                 max_retries: int = 3, backoff: float = 1.0, slow_response: float = 5.0,
+                 min_rate: float = 0.05, max_rate: float = None, rate_step: float = 0.05):
+        self.limiter = limiter or HostRateLimiter(0.5)
+        self.cache = cache
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.slow_response = slow_response
+        self.min_rate = min_rate
+        self.max_rate = max_rate or self.limiter.rate
+        self.rate_step = rate_step
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(BASE_HEADERS)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _adjust_rate(self, url: str, slow_down: bool):
+        """AIMD update of the per-host token bucket rate."""
+        self.limiter.bucket(url).adjust_rate(slow_down, self.min_rate, self.max_rate, self.rate_step)
+
+    def fetch(self, url: str):
+        """
+        Return the body of a url, using the cache when possible.
+
+        Fresh cache entries are returned without touching the network. Stale
+        entries are revalidated with a conditional request, and served as
+        they are if revalidation fails. In replay mode only the cache is consulted.
+
+        Returns:
+            bytes: the page body, or None if it could not be fetched.
+        """
+        done, content, entry = self.lookup(url)
+        if done:
+            return content
+
+        self.limiter.acquire(url)
+        response = self.get(url, headers=entry.validators() if entry else None)
+        if response is None:
+            return self.serve_stale(url, entry)
+        return self.store(url, entry, response.status_code, response.content, response.headers)
+
+    # the steps below are shared with the asyncio client (async_fetch.AsyncScraperClient),
+    # which only replaces the network calls
+
+    def lookup(self, url: str):
+        """
+        Cache step of fetch().
+
+        Returns:
+            tuple: (done, content, entry). When done is True, content is the
+            answer (a fresh hit, or None in replay mode); otherwise entry is the
+            stale entry to revalidate, or None on a miss.
+        """
+        entry = self.cache.get(url) if self.cache else None
+        if entry is not None and entry.fresh:
+            metrics.inc('cache_lookups_total', result='hit')
+            return True, entry.content, entry
+        if self.cache is not None:
+            metrics.inc('cache_lookups_total', result='stale' if entry is not None else 'miss')
+        if self.cache is not None and self.cache.replay:
+            print(f"Not in cache (replay mode): {url}")
+            return True, None, None
+        return False, None, entry
+
+    def store(self, url: str, entry, status: int, content: bytes, headers) -> bytes:
+        """Cache a successful response (or refresh the entry on a 304) and return the body."""
+        if status == 304 and entry is not None:
+            metrics.inc('cache_lookups_total', result='revalidated')
+            self.cache.touch(url, entry)
+            return entry.content
+        if self.cache is not None:
+            self.cache.put(url, content, headers)
+        return content
+
+    def serve_stale(self, url: str, entry):
+        """A stale copy beats no page when revalidation fails; None without one."""
+        if entry is None:
+            return None
+        print(f"Revalidation failed, serving stale cached copy of {url}")
+        metrics.inc('cache_lookups_total', result='stale_served')
+        return entry.content
+
+    def request_headers(self, headers: dict = None) -> dict:
+        request_headers = {'User-Agent': user_agent_pool().random}
+        request_headers.update(headers or {})
+        return request_headers
+
+    def retry_delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        self._count('retries')
+        return self.backoff * (2 ** (attempt - 1)) * random.uniform(1, 1.5)
+
+    def request_failed(self, url: str, error: Exception):
+        """Record a connection level failure; the attempt is retried."""
+        print(f"Error fetching {url}: {error}")
+        self._count('errors')
+        metrics.inc('http_errors_total', reason=type(error).__name__)
+        self._adjust_rate(url, slow_down=True)
+
+    def check_response(self, url: str, status: int, elapsed: float, size: int) -> str:
+        """
+        Record metrics and AIMD throttling for one response.
+
+        Returns:
+            str: 'ok', 'retry' for throttling/server errors, or 'error' for other 4xx.
+        """
+        kind = classify_url(url)
+        metrics.observe('fetch_seconds', elapsed, kind=kind)
+        metrics.inc('http_responses_total', status=status)
+        metrics.inc('fetch_bytes_total', size, kind=kind)
+
+        if status in THROTTLE_STATUSES:
+            self._count('throttled')
+        self._adjust_rate(url, slow_down=status in THROTTLE_STATUSES or elapsed > self.slow_response)
+
+        if status in RETRY_STATUSES:
+            print(f"Got {status} from {url}, retrying")
+            return 'retry'
+        if status >= 400:
+            print(f"Error fetching {url}: HTTP {status}")
+            self._count('errors')
+            return 'error'
+        return 'ok'
+
+    def get(self, url: str, headers: dict = None):
+        """
+        GET a url, retrying transient failures with exponential backoff.
+
+        The caller is expected to have taken a rate limiter token for the
+        first attempt; retries take their own.
+
+        Args:
+            url (str): page to fetch.
+            headers (dict): extra headers merged over the session defaults.
+
+        Returns:
+            requests.Response: the final response (including 304s), or None if every attempt failed.
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_delay(attempt))
+                self.limiter.acquire(url)
+
+            self._count('requests')
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, headers=self.request_headers(headers), timeout=self.timeout)
+            except requests.RequestException as e:
+                self.request_failed(url, e)
+                continue
+            outcome = self.check_response(url, response.status_code, time.monotonic() - started,
+                                          len(response.content))
+            if outcome == 'retry':
+                continue
+            if outcome == 'error':
+                return None
+            return response
+
+        self._count('errors')
+        return None
+
+    def connections_opened(self) -> int:
+        """Number of TCP connections opened so far across all pooled hosts."""
+        total = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    total += pool.num_connections
+        return total
+
+    def close(self):
+        self.session.close()
+
+
+def client_from_config(config: dict, limiter: HostRateLimiter = None,
+                       cache: ResponseCache = None) -> ScraperClient:
+    """Build a ScraperClient from the `scraper` section of the config."""
+    scraper = config.get('scraper') or {}
+    return ScraperClient(
+        limiter=limiter,
+        cache=cache,
+        pool_size=max(scraper.get('concurrency', 4), 1),
+        timeout=scraper.get('timeout', 10),
+        max_retries=scraper.get('max_retries', 3),
+        backoff=scraper.get('backoff', 1.0),
+        slow_response=scraper.get('slow_response', 5.0),
+    )
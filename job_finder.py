@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+job_finder command line: scrape, customize, query, export and frontier. Each
+subcommand imports the modules it needs only when it runs, so light
+commands start without loading bs4, numpy, anthropic or pydantic.
+
+Config comes from --config, then $JOB_FINDER_CONFIG, then config2.yaml.
+"""
+import argparse
+import json
+import sys
+
+from app_config import CONFIG_ENV, config_path, load_config
+
+
+def cmd_scrape(args, config: dict):
+    from linkedin_job_scraper import scrape_to_jsonl
+    import metrics
+
+    job_search = config['job_search']
+    if args.max_results is not None:
+        job_search['max_results'] = args.max_results
+    if args.output:
+        job_search['output_path'] = args.output
+    if args.fetch_mode:
+        config.setdefault('scraper', {})['fetch_mode'] = args.fetch_mode
+    metrics.metrics_from_config(config)
+    print(f"Searching for {len(job_search['job_titles'])} job types in {job_search['location']}")
+    if not scrape_to_jsonl(config):
+        print("No jobs found")
+
+
+def cmd_customize(args, config: dict):
+    from resume_cover_letter_customizer import run
+
+    run(config, dry_run=args.dry_run, jobs_path=args.jobs, output_path=args.output)
+
+
+def cmd_query(args, config: dict):
+    from job_store import main as store_main
+
+    db = args.db or (config.get('job_store') or {}).get('path') or 'jobs.sqlite'
+    store_main(['--db', db, *args.query_args])
+
+
+def cmd_frontier(args, config: dict):
+    from frontier import build_parser as frontier_parser, run_command
+
+    parser = frontier_parser(prog='job_finder frontier', with_config=False)
+    run_command(parser.parse_args(args.frontier_args), config)
+
+
+def cmd_export(args, config: dict):
+    if args.source == 'jsonl':
+        from pathlib import Path
+        from results_log import export_json
+
+        json_path = Path(args.output or config['job_search'].get('output_path') or 'job_results.json')
+        jsonl_path = Path(args.input) if args.input else json_path.with_suffix('.jsonl')
+        if not jsonl_path.exists():
+            print(f"No results log at {jsonl_path}, leaving {json_path} unchanged")
+            return
+        print(f"Exported {export_json(jsonl_path, json_path)} jobs from {jsonl_path} to {json_path}")
+        return
+
+    from job_store import JobStore
+
+    db = args.input or (config.get('job_store') or {}).get('path') or 'jobs.sqlite'
+    output_path = args.output or 'jobs_export.json'
+    store = JobStore(db)
+    try:
+        jobs = list(store.jobs_between(args.since, args.until))
+    finally:
+        store.close()
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(jobs, f, indent=2, ensure_ascii=False)
+    print(f"Exported {len(jobs)} jobs from {db} to {output_path}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='job_finder', description='Scrape jobs and customize applications.')
+    parser.add_argument('--config', help=f'config file (default: ${CONFIG_ENV} or config2.yaml)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scrape = commands.add_parser('scrape', help='scrape LinkedIn postings into job_results.json(l)')
+    scrape.add_argument('--max-results', type=int, help='override job_search.max_results')
+    scrape.add_argument('--output', help='override job_search.output_path')
+    scrape.add_argument('--fetch-mode', choices=('sequential', 'threaded', 'async'), help='override scraper.fetch_mode')
+    scrape.set_defaults(handler=cmd_scrape)
+
+    customize = commands.add_parser('customize', help='generate resumes and cover letters for scraped jobs')
+    customize.add_argument('--jobs', help='scraped jobs file (default: job_search.output_path)')
+    customize.add_argument('--output', help='results file (default: generation.output_path)')
+    customize.add_argument('--dry-run', action='store_true',
+                           help='validate inputs and print prompt sizes and projected cost without calling the API')
+    customize.set_defaults(handler=cmd_customize)
+
+    query = commands.add_parser('query', help='query the job store (import, search, pay, companies, window)',
+                                description='Arguments after `query` are passed to the job store command line, '
+                                            'e.g. `query search "python AND sql" --min-pay 150000`.')
+    query.add_argument('--db', help='job store path (default: job_store.path)')
+    query.add_argument('query_args', nargs=argparse.REMAINDER)
+    query.set_defaults(handler=cmd_query)
+
+    frontier = commands.add_parser('frontier', help='shared crawl queue (seed, work, stats, reclaim)',
+                                   description='Arguments after `frontier` are passed to the crawl frontier, '
+                                               'e.g. `frontier seed --crawl 2025-06-01` or `frontier work --workers 4`.')
+    frontier.add_argument('frontier_args', nargs=argparse.REMAINDER)
+    frontier.set_defaults(handler=cmd_frontier)
+
+    export = commands.add_parser('export', help='write scraped jobs to a JSON file')
+    export.add_argument('--source', choices=('jsonl', 'db'), default='jsonl',
+                        help='jsonl: JSONL results log to job_results.json; db: job store to JSON')
+    export.add_argument('--input', help='JSONL file or job store path')
+    export.add_argument('--output', help='JSON file to write')
+    export.add_argument('--since', help='db source only: ISO lower bound on scraped_at')
+    export.add_argument('--until', help='db source only: ISO upper bound on scraped_at')
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        config = load_config(args.config)
+    except FileNotFoundError:
+        print(f"Config file not found: {config_path(args.config)}")
+        return 1
+    args.handler(args, config)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+canonical LinkedIn job ids and a persistent index of
+postings already seen/extracted, for incremental scraping
+"""
+import re
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# /jobs/view/<slug>-<id> or /jobs/view/<id>
+JOB_ID_PATTERN = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)/?$')
+
+
+def job_id_from_url(url: str) -> Optional[str]:
+    """Numeric LinkedIn job id from a /jobs/view/ url, or None if the url is not a job page."""
+    match = JOB_ID_PATTERN.search(urlsplit(url).path)
+    return match.group(1) if match else None
+
+
+def canonical_job_url(url: str) -> str:
+    """Job url without query string or fragment, so the same posting always maps to one url."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme or 'https', parts.netloc or 'www.linkedin.com', parts.path.rstrip('/'), '', ''))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class SeenJobsIndex:
+    """
+    SQLite table of every job id the scraper has discovered, with
+    first/last seen timestamps and when its details were last extracted.
+    """
+
+    def __init__(self, path: str = 'seen_jobs.sqlite'):
+        self.path = path
+        # frontier workers share the index, so wait on their writes instead of failing
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_id TEXT PRIMARY KEY,
+                job_url TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                extracted_at TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def record_seen(self, job_urls: Iterable[str]):
+        """Insert newly discovered jobs and bump last_seen on ones already known."""
+        now = _now()
+        rows = [(job_id_from_url(url), canonical_job_url(url), now, now) for url in job_urls]
+        self.conn.executemany("""
+            INSERT INTO seen_jobs (job_id, job_url, first_seen, last_seen) VALUES (?, ?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET last_seen = excluded.last_seen
+        """, [row for row in rows if row[0] is not None])
+        self.conn.commit()
+
+    def extracted_ids(self) -> set:
+        """Ids of jobs whose details have already been extracted."""
+        return {row[0] for row in self.conn.execute(
+            "SELECT job_id FROM seen_jobs WHERE extracted_at IS NOT NULL")}
+
+    def mark_extracted(self, job_urls: Iterable[str]):
+        now = _now()
+        self.conn.executemany(
+            "UPDATE seen_jobs SET extracted_at = ? WHERE job_id = ?",
+            [(now, job_id_from_url(url)) for url in job_urls])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+SQLite store for scraped jobs with an FTS5 index over the
+job descriptions, plus a small query API and command line
+"""
+import argparse
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from job_index import job_id_from_url
+from results_log import read_jsonl
+from compensation import parse_compensation
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_url TEXT NOT NULL UNIQUE,
+    job_id TEXT,
+    job_name TEXT,
+    company TEXT,
+    job_description TEXT,
+    additional_info TEXT,
+    scraped_at TEXT NOT NULL,
+    pay_min REAL,
+    pay_max REAL,
+    pay_currency TEXT,
+    pay_period TEXT,
+    pay_annual_min REAL,
+    pay_annual_max REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_name ON jobs(job_name);
+CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs(scraped_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_id ON jobs(job_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    job_name, company, job_description,
+    content='jobs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, job_name, company, job_description)
+    VALUES (new.id, new.job_name, new.company, new.job_description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, job_name, company, job_description)
+    VALUES ('delete', old.id, old.job_name, old.company, old.job_description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, job_name, company, job_description)
+    VALUES ('delete', old.id, old.job_name, old.company, old.job_description);
+    INSERT INTO jobs_fts(rowid, job_name, company, job_description)
+    VALUES (new.id, new.job_name, new.company, new.job_description);
+END;
+"""
+
+# structured compensation fields, added to stores created before they existed
+PAY_COLUMNS = {
+    'pay_min': 'REAL', 'pay_max': 'REAL', 'pay_currency': 'TEXT', 'pay_period': 'TEXT',
+    'pay_annual_min': 'REAL', 'pay_annual_max': 'REAL',
+}
+
+JOB_COLUMNS = ('job_url', 'job_id', 'job_name', 'company', 'job_description', 'additional_info', 'scraped_at',
+               *PAY_COLUMNS)
+
+
+def _pay_fields(record: dict) -> tuple:
+    """Pay columns of a record; records saved before structured pay are parsed from additional_info."""
+    pay = record.get('compensation') or parse_compensation(record.get('additional_info') or '') or {}
+    return (pay.get('min'), pay.get('max'), pay.get('currency'), pay.get('period'),
+            pay.get('annual_min'), pay.get('annual_max'))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class JobStore:
+    """
+    Scraped jobs in SQLite. Columns used for filtering (job_url, company,
+    job_name, scraped_at) are indexed and job text is searchable through
+    FTS5, so queries never load the whole corpus into memory.
+    """
+
+    def __init__(self, path: str = 'jobs.sqlite'):
+        self.path = path
+        # frontier workers write to the same store, wait on each other's writes
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        existing = {row['name'] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        for column, column_type in PAY_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {column_type}')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_pay_annual_max ON jobs(pay_annual_max)')
+
+    def upsert_jobs(self, records: Iterable[dict], scraped_at: str = None) -> int:
+        """
+        Insert or update jobs keyed on job_url.
+
+        Args:
+            records (Iterable[dict]): job detail dicts as produced by the scraper.
+            scraped_at (str): ISO timestamp for records without one; defaults to now.
+
+        Returns:
+            int: number of records written.
+        """
+        scraped_at = scraped_at or _now()
+        rows = (
+            (r['job_url'], job_id_from_url(r['job_url']), r.get('job_name'), r.get('company'),
+             r.get('job_description'), r.get('additional_info'), r.get('scraped_at') or scraped_at,
+             *_pay_fields(r))
+            for r in records
+        )
+        cursor = self.conn.executemany(f"""
+            INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({', '.join('?' * len(JOB_COLUMNS))})
+            ON CONFLICT(job_url) DO UPDATE SET
+                job_name = excluded.job_name,
+                company = excluded.company,
+                job_description = excluded.job_description,
+                additional_info = excluded.additional_info,
+                scraped_at = excluded.scraped_at,
+                {', '.join(f'{column} = excluded.{column}' for column in PAY_COLUMNS)}
+        """, rows)
+        self.conn.commit()
+        return cursor.rowcount
+
+    def import_file(self, path: str) -> int:
+        """Load a job_results.json list or a job_results.jsonl stream."""
+        if str(path).endswith('.jsonl'):
+            return self.upsert_jobs(read_jsonl(path))
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.upsert_jobs(json.load(f))
+
+    @staticmethod
+    def _window(since: Optional[str], until: Optional[str], column: str = 'scraped_at') -> Tuple[str, list]:
+        clauses, params = [], []
+        if since:
+            clauses.append(f"{column} >= ?")
+            params.append(since)
+        if until:
+            clauses.append(f"{column} < ?")
+            params.append(until)
+        return ' AND '.join(clauses), params
+
+    @staticmethod
+    def _pay_filter(min_pay: Optional[float], currency: Optional[str], prefix: str = '') -> Tuple[List[str], list]:
+        clauses, params = [], []
+        if min_pay is not None:
+            clauses.append(f"{prefix}pay_annual_max >= ?")
+            params.append(min_pay)
+        if currency:
+            clauses.append(f"{prefix}pay_currency = ?")
+            params.append(currency.upper())
+        return clauses, params
+
+    def search(self, query: str, limit: int = 20, since: str = None, until: str = None,
+               min_pay: float = None, currency: str = None) -> List[dict]:
+        """
+        Full-text search over job name, company and description, best matches first.
+
+        Args:
+            query (str): FTS5 query, e.g. 'python AND "machine learning"'.
+            limit (int): maximum number of jobs returned.
+            since, until (str): optional ISO bounds on scraped_at.
+            min_pay (float): only jobs whose annualized maximum pay is at least this.
+            currency (str): only jobs paying in this currency, e.g. USD.
+
+        Returns:
+            List[dict]: matching jobs with a highlighted description snippet.
+        """
+        where, params = self._window(since, until, 'jobs.scraped_at')
+        pay_clauses, pay_params = self._pay_filter(min_pay, currency, 'jobs.')
+        where = ' AND '.join(filter(None, [where, *pay_clauses]))
+        params += pay_params
+        rows = self.conn.execute(f"""
+            SELECT jobs.job_url, jobs.job_name, jobs.company, jobs.scraped_at, jobs.additional_info,
+                   jobs.pay_annual_min, jobs.pay_annual_max, jobs.pay_currency,
+                   snippet(jobs_fts, 2, '[', ']', '...', 16) AS snippet
+            FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+            WHERE jobs_fts MATCH ? {'AND ' + where if where else ''}
+            ORDER BY bm25(jobs_fts)
+            LIMIT ?
+        """, [query, *params, limit])
+        return [dict(row) for row in rows]
+
+    def jobs_by_pay(self, min_pay: float = None, currency: str = None, since: str = None,
+                    until: str = None, limit: int = 20) -> List[dict]:
+        """
+        Jobs with structured pay, highest annualized maximum first.
+
+        Args:
+            min_pay (float): minimum annualized maximum pay.
+            currency (str): optional currency code, e.g. USD.
+            since, until (str): optional ISO bounds on scraped_at.
+            limit (int): maximum number of jobs returned.
+
+        Returns:
+            List[dict]: jobs with their pay columns.
+        """
+        where, params = self._window(since, until)
+        pay_clauses, pay_params = self._pay_filter(min_pay, currency)
+        where = ' AND '.join(filter(None, [where, 'pay_annual_max IS NOT NULL', *pay_clauses]))
+        rows = self.conn.execute(f"""
+            SELECT job_url, job_name, company, scraped_at, additional_info, {', '.join(PAY_COLUMNS)}
+            FROM jobs WHERE {where}
+            ORDER BY pay_annual_max DESC, pay_annual_min DESC
+            LIMIT ?
+        """, [*params, *pay_params, limit])
+        return [dict(row) for row in rows]
+
+    def company_counts(self, since: str = None, until: str = None, limit: int = None) -> List[Tuple[str, int]]:
+        """Number of postings per company, most frequent first."""
+        where, params = self._window(since, until)
+        sql = f"""
+            SELECT company, COUNT(*) AS n FROM jobs
+            {'WHERE ' + where if where else ''}
+            GROUP BY company ORDER BY n DESC, company
+        """
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [(row['company'], row['n']) for row in self.conn.execute(sql, params)]
+
+    def jobs_between(self, since: str = None, until: str = None) -> Iterator[dict]:
+        """Stream jobs scraped inside a date window, oldest first."""
+        where, params = self._window(since, until)
+        cursor = self.conn.execute(f"""
+            SELECT {', '.join(JOB_COLUMNS)} FROM jobs
+            {'WHERE ' + where if where else ''}
+            ORDER BY scraped_at
+        """, params)
+        for row in cursor:
+            yield dict(row)
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query the scraped job store.')
+    parser.add_argument('--db', default='jobs.sqlite', help='path to the SQLite job store')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('import', help='load job_results.json or job_results.jsonl')
+    load.add_argument('paths', nargs='+')
+
+    search = commands.add_parser('search', help='full-text search over job descriptions')
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=20)
+
+    pay = commands.add_parser('pay', help='jobs with structured pay, highest first')
+    pay.add_argument('--limit', type=int, default=20)
+
+    for sub in (search, pay):
+        sub.add_argument('--min-pay', type=float, default=None, help='minimum annualized pay')
+        sub.add_argument('--currency', help='currency code, e.g. USD')
+
+    companies = commands.add_parser('companies', help='posting counts per company')
+    companies.add_argument('--limit', type=int, default=None)
+
+    window = commands.add_parser('window', help='list jobs scraped inside a date window')
+
+    for sub in (search, pay, companies, window):
+        sub.add_argument('--since', help='ISO date/time lower bound on scraped_at')
+        sub.add_argument('--until', help='ISO date/time upper bound on scraped_at')
+
+    args = parser.parse_args(argv)
+    store = JobStore(args.db)
+    try:
+        if args.command == 'import':
+            for path in args.paths:
+                print(f"Imported {store.import_file(path)} jobs from {path}")
+            print(f"{store.count()} jobs in {args.db}")
+        elif args.command == 'search':
+            for job in store.search(args.query, args.limit, args.since, args.until, args.min_pay, args.currency):
+                print(f"{job['job_name']} at {job['company']} ({job['scraped_at']})")
+                print(f"   URL: {job['job_url']}")
+                print(f"   {job['snippet']}")
+        elif args.command == 'pay':
+            for job in store.jobs_by_pay(args.min_pay, args.currency, args.since, args.until, args.limit):
+                print(f"{job['pay_annual_min']:>10,.0f} - {job['pay_annual_max']:>10,.0f} {job['pay_currency']}  "
+                      f"{job['job_name']} at {job['company']}  ({job['additional_info']})")
+                print(f"   URL: {job['job_url']}")
+        elif args.command == 'companies':
+            for company, n in store.company_counts(args.since, args.until, args.limit):
+                print(f"{n:6d}  {company}")
+        elif args.command == 'window':
+            for job in store.jobs_between(args.since, args.until):
+                print(f"{job['scraped_at']}  {job['job_name']} at {job['company']}  {job['job_url']}")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,175 +4,269 @@ Simple LinkedIn Job Scraper
 Scrapes LinkedIn job postings and extracts job details.
 """
 
-import requests
 from bs4 import BeautifulSoup
-import yaml
-import time
-import random
+import asyncio
 import json
-from fake_useragent import UserAgent
-
-def load_config():
-    """Load configuration from YAML file."""
-    with open('config2.yaml', 'r') as file:
-        return yaml.safe_load(file)
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlencode
+from rate_limit import limiter_from_config
+from http_cache import cache_from_config
+from html_parsing import DEFAULT_BACKEND, parse_job_details
+from parse_pool import iter_parsed, resolve_workers
+from job_index import SeenJobsIndex, canonical_job_url, job_id_from_url
+from results_log import JsonlResultWriter, export_json
+from job_store import JobStore
+import metrics
+import app_config
+from http_client import BASE_HEADERS, ScraperClient, client_from_config, user_agent_pool
+from async_fetch import iter_fetch, iter_fetch_async
+
+# shared client so every fetch reuses pooled connections
+_default_client = None
+
+# sequential: one page at a time; threaded: a thread pool;
+# async: an asyncio event loop with aiohttp
+FETCH_MODES = ('sequential', 'threaded', 'async')
+
+# LinkedIn search pages list 25 postings each, paged with `start`
+RESULTS_PER_PAGE = 25
+
+def load_config(path=None):
+    """Load configuration from YAML file (path, $JOB_FINDER_CONFIG or config2.yaml)."""
+    return app_config.load_config(path)
 
 def get_random_headers():
     """Generate random headers to avoid detection."""
-    ua = UserAgent()
-    return {
-        'User-Agent': ua.random,
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
-
-def fetch_page(url):
-    """Fetch a web page with random headers."""
-    headers = get_random_headers()
+    return {'User-Agent': user_agent_pool().random, **BASE_HEADERS}
+
+def get_client():
+    """Return the module level ScraperClient, creating it on first use."""
+    global _default_client
+    if _default_client is None:
+        _default_client = ScraperClient()
+    return _default_client
+
+def fetch_html(url, client=None):
+    """Fetch the raw bytes of a web page with random headers."""
+    client = client or get_client()
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return BeautifulSoup(response.content, 'html.parser')
+        return client.fetch(url)
     except Exception as e:
         print(f"Error fetching {url}: {e}")
         return None
 
-def get_job_links(config):
-    """Get job links from LinkedIn search for multiple job titles."""
-    job_titles = config['job_search']['job_titles']
-    location = config['job_search']['location']
+def fetch_page(url, client=None):
+    """Fetch a web page with random headers."""
+    content = fetch_html(url, client)
+    if content is None:
+        return None
+    with metrics.timer('search_parse_seconds'):
+        return BeautifulSoup(content, 'html.parser')
+
+async def fetch_page_async(url, http):
+    """
+    Async counterpart of fetch_page for the asyncio engine.
+
+    Args:
+        url (str): page to fetch.
+        http (AsyncScraperClient): event loop client sharing the run's cache and rate limiter.
+    """
+    content = await http.fetch(url)
+    if content is None:
+        return None
+    # parsing is CPU work, keep it off the event loop
+    with metrics.timer('search_parse_seconds'):
+        return await asyncio.to_thread(BeautifulSoup, content, 'html.parser')
+
+def build_search_url(config, job_title, start=0):
+    """LinkedIn search url for one job title and results offset, honouring time_filter."""
+    job_search = config['job_search']
+    base_url = (config.get('linkedin') or {}).get('base_url', 'https://www.linkedin.com/jobs/search')
+    params = {'keywords': job_title, 'location': job_search['location']}
+    if job_search.get('time_filter'):
+        params['f_TPR'] = job_search['time_filter']
+    if start:
+        params['start'] = start
+    return f"{base_url}?{urlencode(params)}"
+
+def iter_search_pages(config, job_title, client=None):
+    """Lazily yield the parsed result pages of one search, fetching the next page only when asked."""
+    max_pages = config['job_search'].get('max_pages', 5)
+    for page in range(max_pages):
+        soup = fetch_page(build_search_url(config, job_title, page * RESULTS_PER_PAGE), client)
+        if not soup:
+            return
+        yield soup
+
+def job_links_from_page(soup):
+    """(job id, canonical url) of every job link on a search results page, in page order."""
+    links = []
+    # Find job links - simplified selector
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if '/jobs/view/' not in href:
+            continue
+        if href.startswith('/'):
+            href = f"https://www.linkedin.com{href}"
+        job_id = job_id_from_url(href)
+        if job_id is not None:
+            links.append((job_id, canonical_job_url(href)))
+    return links
+
+def iter_job_links(config, client=None, skip_ids=None):
+    """
+    Lazily yield job links from LinkedIn search for multiple job titles.
+
+    Links are deduplicated on their numeric job id and yielded as canonical
+    urls; ids in `skip_ids` (e.g. jobs already extracted) are left out.
+    Paging stops as soon as max_results links have been yielded or a
+    results page has no job links.
+    """
     max_results = config['job_search'].get('max_results', 10)
-
-    all_job_links = []
+    seen_ids = set(skip_ids or ())
+    found = 0
+    if max_results <= 0:
+        return
 
     # loop over relavent job titles and identify associated openings
-    for job_title in job_titles:
+    for job_title in config['job_search']['job_titles']:
         print(f"Searching for: {job_title}")
-        search_url = f"https://www.linkedin.com/jobs/search?keywords={job_title}&location={location}"
 
-        # return the page of linked in results, or 
-        # continue to the next job title if none exists
-        soup = fetch_page(search_url)
-        if not soup:
-            continue
-
-        # Find job links - simplified selector
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if '/jobs/view/' in href:
-                if href.startswith('/'):
-                    href = f"https://www.linkedin.com{href}"
-                if href not in all_job_links:
-                    all_job_links.append(href)
+        for soup in iter_search_pages(config, job_title, client):
+            page_links = job_links_from_page(soup)
+            for job_id, job_url in page_links:
+                if job_id not in seen_ids:
+                    seen_ids.add(job_id)
+                    yield job_url
+                    found += 1
+                    if found >= max_results:
+                        return
+
+            # an empty page means we ran past the last page of results
+            if not page_links:
+                break
 
-        # Add delay between searches
-        time.sleep(random.uniform(1, 2))
+def get_job_links(config, client=None, skip_ids=None):
+    """Get up to max_results job links from LinkedIn search for multiple job titles."""
+    return list(iter_job_links(config, client, skip_ids))
 
-    # Limit total results
-    return all_job_links[:max_results]
+def failed_job_details(job_url):
+    """Placeholder record for a job page that could not be fetched."""
+    return {
+        'job_url': job_url,
+        'job_name': 'Failed to fetch',
+        'company': 'Failed to fetch',
+        'job_description': 'Failed to fetch',
+        'additional_info': 'Could not access page',
+        'compensation': None
+    }
 
-def extract_job_details(job_url):
-    """Extract job details from a single job page."""
+def fetch_job_page(job_url, client=None):
+    """Raw bytes of a single job page, for parsing in a separate stage."""
     print(f"Extracting: {job_url}")
+    return fetch_html(job_url, client)
 
-    soup = fetch_page(job_url)
-    if not soup:
-        return {
-            'job_url': job_url,
-            'job_name': 'Failed to fetch',
-            'company': 'Failed to fetch',
-            'job_description': 'Failed to fetch',
-            'additional_info': 'Could not access page'
-        }
-
-    # Extract job title/name
-    job_name = ""
-    title_selectors = ['h1', '.top-card-layout__title'
-                       , '.job-details-jobs-unified-top-card__job-title', 'title']
-    
-    for selector in title_selectors:
-        element = soup.select_one(selector)
-        if element:
-            text = element.get_text(strip=True)
-            # Clean up common prefixes/suffixes and take relevant part
-            if len(text) > 5 and 'linkedin' not in text.lower():
-                job_name = text.split('|')[0].split('-')[0].strip()  # Take first part before separators
-                break
+def extract_job_details(job_url, client=None, parser=DEFAULT_BACKEND):
+    """Extract job details from a single job page."""
+    with metrics.timer('extract_seconds'):
+        content = fetch_job_page(job_url, client)
+        if content is None:
+            return failed_job_details(job_url)
 
-    # Extract company name
-    company = ""
-    company_selectors = [
-        '.job-details-jobs-unified-top-card__company-name',
-        '.jobs-unified-top-card__company-name',
-        '.top-card-layout__second-subline',
-        '.job-details-jobs-unified-top-card__primary-description-container a',
-        'a[data-tracking-control-name="job_details_topcard_company_url"]'
-    ]
-
-    for selector in company_selectors:
-        element = soup.select_one(selector)
-        if element:
-            text = element.get_text(strip=True)
-            if len(text) > 1 and 'linkedin' not in text.lower():
-                # Clean up company name - remove location and other metadata
-                company = text.split('Charlotte, NC')[0].split(' ago')[0].split(' applicants')[0].strip()
-                if company:
-                    break
-
-    # If no company found in selectors, try to extract from URL or page title
-    if not company:
-        # Try to extract from URL pattern
-        if '-at-' in job_url:
-            url_parts = job_url.split('-at-')
-            if len(url_parts) > 1:
-                company_part = url_parts[1].split('-')[0]
-                company = company_part.replace('-', ' ').title()
-
-    # Extract description - look for job-specific content
-    description = ""
-
-    # Try common job description selectors first
-    for selector in ['.show-more-less-html__markup', '.jobs-description__content', '.job-description']:
-        element = soup.select_one(selector)
-        if element:
-            description = element.get_text(strip=True)
-            break
-
-    # Fallback: find text containing job-related keywords
-    if not description:
-        job_keywords = ['responsibilities', 'requirements', 'experience',
-                         'skills', 'qualifications', 'position', 'role','duties']
-        for element in soup.find_all(['div', 'section']):
-            text = element.get_text(strip=True).lower()
-            if len(text) > 300 and any(keyword in text for keyword in job_keywords):
-                description = element.get_text(strip=True)
-                break
+        with metrics.timer('parse_seconds', backend=parser):
+            return parse_job_details(job_url, content, parser)
 
-    # TO DO 
-    # CLEAN UP JOB DESCRIPTION FURTHER, FIGURE OUT HOW TO REMOVE BOILERPLATE TEXT AND ONLY 
-    # INCLUDE INFORMATION SPECIFIC ABOUT THE JOB, NOT THE COMPANY!
-
-    # Extract compensation info - simplified
-    compensation = "No compensation info found"
-    page_text = soup.get_text().lower()
-    if '$' in page_text:
-        # Look for salary patterns
-        for word in page_text.split():
-            if '$' in word and any(char.isdigit() for char in word):
-                compensation = f"{word}"
-                break
+async def fetch_job_page_async(job_url, http):
+    """Async fetch_job_page: raw bytes of a job page fetched on the event loop."""
+    print(f"Extracting: {job_url}")
+    return await http.fetch(job_url)
+
+async def extract_job_details_async(job_url, http, parser=DEFAULT_BACKEND):
+    """Async extract_job_details: fetch on the event loop, parse in a worker thread."""
+    with metrics.timer('extract_seconds'):
+        content = await fetch_job_page_async(job_url, http)
+        if content is None:
+            return failed_job_details(job_url)
+
+        with metrics.timer('parse_seconds', backend=parser):
+            return await asyncio.to_thread(parse_job_details, job_url, content, parser)
+
+def print_client_stats(client):
+    """Print request, connection and cache counters for the run."""
+    print(f"Client stats: {client.stats}, connections opened: {client.connections_opened()}")
+    if client.cache is not None:
+        print(f"Cache stats: {client.cache.stats}")
+
+def iter_scraped_jobs(config, skip_ids=None):
+    """
+    Streaming scrape pipeline: search pages are paged lazily and each
+    discovered link goes straight to extraction, so job details are
+    yielded as soon as they are ready. Job ids in `skip_ids` are not fetched.
+    """
+    scraper = config.get('scraper') or {}
+    if scraper.get('fetch_mode', 'sequential') not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch_mode {scraper['fetch_mode']!r}, expected one of {FETCH_MODES}")
+
+    # one limiter, cache and connection pool for the whole run so search and
+    # job pages share the per-host budget and reuse connections; the client
+    # only takes a rate limiter token when a page is not served from cache
+    limiter = limiter_from_config(config)
+    cache = cache_from_config(config)
+    client = client_from_config(config, limiter, cache)
+
+    # the seen-jobs index lets scheduled runs skip postings already extracted
+    job_search = config['job_search']
+    index = SeenJobsIndex(job_search.get('index_path', 'seen_jobs.sqlite'))
+    if job_search.get('incremental', False):
+        skip_ids = index.extracted_ids() | set(skip_ids or ())
+
+    parser = scraper.get('parser', DEFAULT_BACKEND)
+    parse_workers = resolve_workers(scraper.get('parse_workers', 0))
+    fetch_mode = scraper.get('fetch_mode', 'sequential')
+    concurrency = scraper.get('concurrency', 4)
+
+    def discovered_links():
+        for job_url in iter_job_links(config, client, skip_ids):
+            index.record_seen([job_url])
+            yield job_url
+
+    if parse_workers:
+        # fetching only downloads; parsing runs in a process pool so it
+        # is not capped at one core, and only the extracted dicts come back
+        if fetch_mode == 'async':
+            fetched = iter_fetch_async(discovered_links(), fetch_job_page_async, client, concurrency)
+        elif fetch_mode == 'threaded':
+            fetched = iter_fetch(discovered_links(), partial(fetch_job_page, client=client), concurrency=concurrency)
+        else:
+            fetched = ((job_url, fetch_job_page(job_url, client)) for job_url in discovered_links())
+        results = iter_parsed(fetched, partial(parse_job_details, backend=parser), workers=parse_workers)
+    elif fetch_mode == 'async':
+        # pages are fetched concurrently on an asyncio event loop (aiohttp)
+        extract = partial(extract_job_details_async, parser=parser)
+        results = iter_fetch_async(discovered_links(), extract, client, concurrency)
+    elif fetch_mode == 'threaded':
+        extract = partial(extract_job_details, client=client, parser=parser)
+        results = iter_fetch(discovered_links(), extract, concurrency=concurrency)
+    else:
+        # Extract details for each job, the rate limiter keeps us polite
+        extract = partial(extract_job_details, client=client, parser=parser)
+        results = ((job_url, extract(job_url)) for job_url in discovered_links())
 
-    return {
-        'job_url': job_url,
-        'job_name': job_name or 'No title found',
-        'company': company or 'No company found',
-        'job_description': description or 'No description found',
-        'additional_info': compensation
-    }
+    try:
+        for i, (job_url, details) in enumerate(results, 1):
+            print(f"Processed job {i}")
+            details = details or failed_job_details(job_url)
+            extracted = details['job_name'] != 'Failed to fetch'
+            metrics.inc('jobs_extracted_total', result='ok' if extracted else 'failed')
+            yield details
+            # the consumer resumes us only once it has saved the job, so a
+            # crash while writing leaves it to be fetched again next run
+            if extracted:
+                index.mark_extracted([job_url])
+    finally:
+        index.close()
+        print_client_stats(client)
 
 def scrape_jobs():
     """Main scraping function."""
@@ -183,54 +277,73 @@ def scrape_jobs():
     print(f"Searching for {len(job_titles)} job types in {location}")
     print(f"Job titles: {', '.join(job_titles)}")
 
-    # Get job links
-    job_links = get_job_links(config)
-    print(f"Found {len(job_links)} job links")
-
-    if not job_links:
-        return []
-
-    # Extract details for each job
-    job_details = []
-    for i, job_url in enumerate(job_links, 1):
-        print(f"Processing job {i}/{len(job_links)}")
-        details = extract_job_details(job_url)
-        job_details.append(details)
-
-        # Random delay to be polite
-        if i < len(job_links):
-            time.sleep(random.uniform(1, 3))
-
+    job_details = list(iter_scraped_jobs(config))
+    print(f"Found {len(job_details)} jobs")
     return job_details
 
-def save_results(job_details):
+def save_results(job_details, output_path='job_results.json'):
     """Save results to JSON file."""
-    with open('job_results.json', 'w', encoding='utf-8') as f:
+    with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(job_details, f, indent=2, ensure_ascii=False)
-    print(f"Saved {len(job_details)} jobs to job_results.json")
+    print(f"Saved {len(job_details)} jobs to {output_path}")
+
+def scrape_to_jsonl(config):
+    """
+    Run the scrape pipeline, appending each job to the JSONL output as soon
+    as it is extracted, then export job_results.json. An interrupted run
+    resumes from the checkpoint on the next call. A run that finds no jobs
+    (e.g. an incremental run with nothing new) keeps the previous output.
+
+    Returns:
+        int: number of jobs in the exported job_results.json, 0 if nothing was found.
+    """
+    output_path = Path(config['job_search'].get('output_path') or 'job_results.json')
+    writer = JsonlResultWriter(output_path.with_suffix('.jsonl'))
+    done_urls = writer.open()
+
+    # a resumed run only needs the jobs still missing from the quota
+    if done_urls:
+        config = {**config, 'job_search': {**config['job_search'],
+                  'max_results': max(config['job_search'].get('max_results', 10) - len(done_urls), 0)}}
+    done_ids = {job_id_from_url(url) for url in done_urls}
+
+    # optional queryable store alongside the JSONL output
+    store_path = (config.get('job_store') or {}).get('path')
+    store = JobStore(store_path) if store_path else None
+
+    complete = False
+    try:
+        for i, job in enumerate(iter_scraped_jobs(config, done_ids), len(done_urls) + 1):
+            writer.append(job)
+            if store is not None:
+                store.upsert_jobs([job])
+            print(f"\n{i}. {job['job_name']} at {job['company']}")
+            print(f"   URL: {job['job_url']}")
+            print(f"   Description: {job['job_description'][:100]}...")
+            print(f"   Info: {job['additional_info']}")
+        complete = True
+    finally:
+        writer.close(complete)
+        if store is not None:
+            store.close()
+        metrics.write_from_config(config)
+
+    if not writer.completed:
+        print(f"No new jobs found, keeping the previous {output_path}")
+        return 0
+    return export_json(writer.jsonl_path, output_path)
 
 def main():
     """Main function."""
     try:
-        job_details = scrape_jobs()
-
-        if job_details:
-            print(f"\nFound {len(job_details)} jobs:")
-            for i, job in enumerate(job_details, 1):
-                print(f"\n{i}. {job['job_name']} at {job['company']}")
-                print(f"   URL: {job['job_url']}")
-                print(f"   Description: {job['job_description'][:100]}...")
-                print(f"   Info: {job['additional_info']}")
-
-            save_results(job_details)
-            return job_details
-        else:
+        config = load_config()
+        metrics.metrics_from_config(config)
+        print(f"Searching for {len(config['job_search']['job_titles'])} job types in {config['job_search']['location']}")
+        if not scrape_to_jsonl(config):
             print("No jobs found")
-            return []
 
     except Exception as e:
         print(f"Error: {e}")
-        return []
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
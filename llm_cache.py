@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+persistent cache of LLM responses keyed by a fingerprint of the
+model, sampling parameters, system prompt and rendered messages
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Optional
+
+
+def request_fingerprint(model: str, params: dict, system, messages) -> str:
+    """sha256 over everything that determines a response: model, sampling params, system prompt and messages."""
+    payload = json.dumps(
+        {"model": model, "params": params, "system": system, "messages": messages},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite store of generated text by request fingerprint.
+
+    Entries older than `max_age_days` or beyond the `max_entries` most
+    recently used are evicted on open and by evict().
+    """
+
+    def __init__(self, path: str = 'llm_cache.sqlite', max_entries: Optional[int] = None,
+                 max_age_days: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'bypassed': 0, 'evicted': 0}
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                fingerprint TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self.conn.commit()
+        self.evict()
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT response FROM responses WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        self.conn.execute("UPDATE responses SET last_used = ? WHERE fingerprint = ?", (time.time(), fingerprint))
+        self.conn.commit()
+        self.stats['hits'] += 1
+        return row[0]
+
+    def put(self, fingerprint: str, model: str, response: str):
+        now = time.time()
+        self.conn.execute("""
+            INSERT INTO responses (fingerprint, model, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(fingerprint) DO UPDATE SET
+                response = excluded.response, created_at = excluded.created_at, last_used = excluded.last_used
+        """, (fingerprint, model, response, now, now))
+        self.conn.commit()
+        self.stats['stored'] += 1
+
+    def evict(self):
+        """Drop entries past max_age_days, then all but the max_entries most recently used."""
+        evicted = 0
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            evicted += self.conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,)).rowcount
+        if self.max_entries is not None:
+            evicted += self.conn.execute("""
+                DELETE FROM responses WHERE fingerprint NOT IN (
+                    SELECT fingerprint FROM responses ORDER BY last_used DESC LIMIT ?
+                )
+            """, (self.max_entries,)).rowcount
+        self.conn.commit()
+        self.stats['evicted'] += evicted
+
+    def report(self) -> str:
+        lookups = self.stats['hits'] + self.stats['misses']
+        rate = self.stats['hits'] / lookups if lookups else 0.0
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses ({rate:.0%} hit rate), "
+                f"{self.stats['bypassed']} forced regenerations, {self.stats['stored']} stored, "
+                f"{self.stats['evicted']} evicted")
+
+    def close(self):
+        self.conn.close()
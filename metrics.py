@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+lightweight run metrics: counters and timing histograms recorded from the
+scraper and customizer, written out as a JSON summary and a Prometheus
+text file. Disabled by default, where every hook is a cheap no-op.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Dict, Optional, Tuple
+
+PREFIX = 'job_finder_'
+
+# upper bounds in seconds, covering cache hits through slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# the active registry; None while metrics are disabled
+_registry = None
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are estimated as the upper bound of the bucket they fall in."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (self.max,), self.counts):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'min': round(self.min, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+            'p50': round(self.quantile(0.5), 6),
+            'p90': round(self.quantile(0.9), 6),
+            'p99': round(self.quantile(0.99), 6),
+        }
+
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'labels', 'started')
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started, self.labels)
+        return False
+
+
+class Registry:
+    """Thread-safe store of counters and histograms keyed by metric name and labels."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: dict) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, labels: dict = None):
+        key = self._key(labels or {})
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: dict = None):
+        key = self._key(labels or {})
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def summary(self) -> dict:
+        """Per-run JSON summary: every counter and histogram series with its labels."""
+        with self._lock:
+            return {
+                'started_at': self.started,
+                'duration_seconds': round(time.time() - self.started, 3),
+                'counters': {name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                             for name, series in sorted(self.counters.items())},
+                'histograms': {name: [{'labels': dict(key), **hist.summary()} for key, hist in series.items()]
+                               for name, series in sorted(self.histograms.items())},
+            }
+
+    def prometheus_text(self) -> str:
+        """Prometheus text exposition format, e.g. for the node_exporter textfile collector."""
+        def fmt(key: LabelKey, extra: Tuple = ()) -> str:
+            pairs = key + extra
+            if not pairs:
+                return ''
+            escaped = (k + '="' + v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                       for k, v in pairs)
+            return '{' + ','.join(escaped) + '}'
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                lines.extend(f"{PREFIX}{name}{fmt(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for key, hist in series.items():
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets, hist.counts):
+                        cumulative += n
+                        lines.append(f"{PREFIX}{name}_bucket{fmt(key, (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_bucket{fmt(key, (('le', '+Inf'),))} {hist.count}")
+                    lines.append(f"{PREFIX}{name}_sum{fmt(key)} {hist.sum}")
+                    lines.append(f"{PREFIX}{name}_count{fmt(key)} {hist.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, json_path: str = None, prometheus_path: str = None):
+        for path, text in ((json_path, lambda: json.dumps(self.summary(), indent=2)),
+                           (prometheus_path, self.prometheus_text)):
+            if not path:
+                continue
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text())
+            os.replace(tmp_path, path)
+            print(f"Wrote metrics to {path}")
+
+
+def enable() -> Registry:
+    """Start recording into a fresh registry."""
+    global _registry
+    _registry = Registry()
+    return _registry
+
+
+def disable():
+    global _registry
+    _registry = None
+
+
+def registry() -> Optional[Registry]:
+    return _registry
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Add to a counter; names of counters end in _total."""
+    if _registry is not None:
+        _registry.inc(name, value, labels)
+
+
+def observe(name: str, value: float, **labels):
+    """Record a value (seconds, unless the name says otherwise) in a histogram."""
+    if _registry is not None:
+        _registry.observe(name, value, labels)
+
+
+def timer(name: str, **labels):
+    """Context manager timing its block into histogram `name`; a shared no-op when disabled."""
+    if _registry is None:
+        return _NULL_TIMER
+    return _Timer(_registry, name, labels)
+
+
+def metrics_from_config(config: dict) -> Optional[Registry]:
+    """Enable metrics when the `metrics` section of the config asks for them."""
+    if (config.get('metrics') or {}).get('enabled', False):
+        return enable()
+    return None
+
+
+def write_from_config(config: dict):
+    """Write the JSON summary and Prometheus file named in the config, if metrics are enabled."""
+    if _registry is None:
+        return
+    settings = config.get('metrics') or {}
+    _registry.write(settings.get('json_path', 'metrics.json'), settings.get('prometheus_path', 'metrics.prom'))
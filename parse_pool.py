@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+process pool stage that parses fetched pages off the fetch threads, so
+CPU-bound html parsing uses every core while fetching continues
+"""
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import metrics
+
+
+def resolve_workers(workers) -> int:
+    """Number of parse processes for a `scraper.parse_workers` setting: 'auto' means one per core."""
+    if workers == 'auto':
+        return os.cpu_count() or 1
+    return max(0, int(workers or 0))
+
+
+def _timed_parse(parse: Callable, url: str, content: bytes) -> Tuple[dict, float]:
+    """Runs in the worker: parse and report the parse time, since workers have no metrics registry."""
+    started = time.perf_counter()
+    return parse(url, content), time.perf_counter() - started
+
+
+def _skipped() -> Future:
+    future = Future()
+    future.set_result(None)
+    return future
+
+
+def iter_parsed(fetched: Iterable[Tuple[str, Optional[bytes]]], parse: Callable[[str, bytes], dict],
+                workers: int = 2, window: int = None) -> Iterator[Tuple[str, Optional[dict]]]:
+    """
+    Parse (url, raw bytes) pairs in worker processes, yielding results in input order.
+
+    Only the url and bytes are sent to a worker and only the parsed dict comes
+    back, so no parse trees are pickled. Up to `window` pages are queued
+    ahead of the consumer, and the `fetched` source keeps being pulled
+    (and so keeps fetching) while earlier pages are parsed.
+
+    Args:
+        fetched (Iterable[Tuple[str, Optional[bytes]]]): urls and page bodies, None for failed fetches.
+        parse (Callable): picklable module level function (or partial) taking (url, content).
+        workers (int): number of parse processes.
+        window (int): pages in flight, defaults to four per worker.
+
+    Yields:
+        tuple: (url, parsed dict), with None where the fetch failed or parsing raised.
+    """
+    workers = max(1, int(workers))
+    window = window or workers * 4
+    # spawn rather than fork: the fetch threads hold sockets and locks a forked child would inherit
+    context = multiprocessing.get_context('spawn')
+
+    def result(url, future):
+        try:
+            parsed = future.result()
+        except Exception as e:
+            print(f"Error parsing {url}: {e}")
+            return url, None
+        if parsed is None:
+            return url, None
+        details, seconds = parsed
+        metrics.observe('parse_seconds', seconds, backend='process_pool')
+        return url, details
+
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        for url, content in fetched:
+            future = _skipped() if content is None else executor.submit(_timed_parse, parse, url, content)
+            in_flight.append((url, future))
+            if len(in_flight) >= window:
+                yield result(*in_flight.popleft())
+        while in_flight:
+            yield result(*in_flight.popleft())
@@ -21,6 +21,120 @@ def generate_system_prompt() -> str:
     )
 
 
+## task instructions, the single source for both the plain string prompts and
+## the structured (cached) requests: the applicant materials go before them
+## and the job description and company information after
+
+RESUME_INSTRUCTIONS = """You are an expert resume writer specializing in crafting resumes for 
+Data Science Managers working within enterprise functions for a financial institution. 
+Your task is to write a tailored resume for a specific job posting. 
+You have the applicants resume above, and the job posting details follow these instructions. 
+Follow these steps carefully:
+
+1. Review the job description and company information given after these instructions.
+
+2. Review the applicant's resume given above in <applicant_resume> tags.
+
+3. Analyze the job description and company information:
+- Identify key requirements for the job position
+- Note the company's core values
+- Highlight any specific skills or experiences emphasized in the job posting
+
+4. Analyze the applicant's resume:
+- Identify relevant experiences and qualifications that match the job requirements
+- Highlight unique achievements or skills that set the applicant apart
+- Ensure that the applicants management and leadership skills are highlighted. 
+
+5. Craft a tailored resume:
+- Use a clear and professional format
+- Start with a strong summary statement that aligns with the job position
+- Organize work experience in reverse chronological order, emphasizing relevant roles
+- Use bullet points to detail responsibilities and achievements, quantifying results where possible
+- Include relevant skills, certifications, and education that match the job requirements
+- Keep the same formatting style as the original resume
+
+6. Follow this structure for the resume, ensuring it fits on at most 2 pages:
+- Contact Information
+- Summary Statement (2-3 sentences)
+- Work Experience (most recent first)
+- Skills
+- Education
+- Certifications (if applicable)
+
+7. Review and refine the resume:
+- Ensure all key points from the job description are addressed
+
+8. Output the final resume:
+- Write the complete resume within <resume> tags, formatted as it would appear in a formal document.
+
+Remember to maintain the applicant's voice and style while elevating the content to match the position being applied for. 
+The resume should be concise, compelling, and tailored specifically to the company and position described, but do not 
+over embellish information that is not present in the original resume.
+"""
+
+COVER_LETTER_INSTRUCTIONS = """You are an expert cover letter writer specializing in crafting cover letters for Data Science Managers working within enterprise functions for a financial institution. Your task is to write a tailored cover letter for a specific job posting. You have the applicants resume and previous cover letter above, and the job posting details follow these instructions. Follow these steps carefully:
+
+1. Review the job description and company information given after these instructions.
+
+2. Review the applicant's resume and previous cover letter given above in <applicant_resume> and <previous_cover_letter> tags.
+
+3. Analyze the job description and company information:
+- Identify key requirements for the job position
+- Note the company's core values
+- Highlight any specific skills or experiences emphasized in the job posting
+
+4. Analyze the applicant's resume and previous cover letter:
+- Identify relevant experiences and qualifications that match the job requirements
+- Note the applicant's writing style and tone from their previous cover letter
+- Highlight unique achievements or skills that set the applicant apart
+- Ensure that the applicants management and leadership skills are highlighted. 
+
+5. Craft a tailored cover letter:
+- Address the letter to the appropriate person or department
+- Open with a strong, attention-grabbing introduction
+- Align the applicant's qualifications with the positions requirements 
+- Demonstrate knowledge of the company and enthusiasm for the position
+- Use specific examples from the applicant's experience to illustrate their suitability
+- Maintain a professional yet personable tone throughout
+
+6. Follow this structure for the cover letter, the cover letter must fit on a single page:
+- Introduction (1 paragraph)
+- Body (2 paragraphs)
+- Conclusion (1 paragraph)
+
+7. Review and refine the cover letter:
+- Ensure all key points from the job description are addressed
+- Check that the companies values and core job responsibilities are reflected
+- Verify that the applicant's strengths are effectively communicated 
+- Proofread for grammar, spelling, and punctuation errors
+
+8. Output the final cover letter:
+Write the complete cover letter within <cover_letter> tags, formatted as it would appear in a formal document.
+
+Remember to maintain the applicant's voice and style while elevating the content to match the position being applied for. The cover letter should be concise, compelling, and tailored specifically to the company and position described.
+"""
+
+
+def generate_applicant_materials(
+    APPLICANT_RESUME: str,
+    APPLICANT_PREVIOUS_COVER_LETTER: str = None
+) -> str:
+    """
+    Builds the applicant blocks the task instructions refer to.
+
+    Args:
+        applicant_resume (str): The applicant's resume.
+        previous_cover_letter (str): The applicant's previous cover letter, omitted when None.
+
+    Returns:
+        str: The resume (and previous cover letter) in tags.
+    """
+    materials = f"<applicant_resume>\n{APPLICANT_RESUME}\n</applicant_resume>"
+    if APPLICANT_PREVIOUS_COVER_LETTER is not None:
+        materials += f"\n\n<previous_cover_letter>\n{APPLICANT_PREVIOUS_COVER_LETTER}\n</previous_cover_letter>"
+    return materials
+
+
 def generate_resume_prompt(
     JOB_DESCRIPTION: str,
     COMPANY_INFORMATION: str,
@@ -38,62 +152,11 @@ def generate_resume_prompt(
     Returns:
         str: The prompt for generating a customized resume.
     """
-    prompt = f"""You are an expert resume writer specializing in crafting resumes for 
-    Data Science Managers working within enterprise functions for a financial institution. 
-    Your task is to write a tailored resume for a specific job posting. 
-    You will have the applicants resume, and the job posting details to inform the resume. 
-    Follow these steps carefully:
-    
-    1. Review the job description and company information:
-    <job_description>
-    {JOB_DESCRIPTION}
-    </job_description>
-
-    <company_information>
-    {COMPANY_INFORMATION}
-    </company_information>
-
-    2. Review the applicant's resume:
-    <applicant_resume>
-    {APPLICANT_RESUME}
-    </applicant_resume>
-
-    3. Analyze the job description and company information:
-    - Identify key requirements for the job position
-    - Note the company's core values
-    - Highlight any specific skills or experiences emphasized in the job posting
-
-    4. Analyze the applicant's resume:
-    - Identify relevant experiences and qualifications that match the job requirements
-    - Highlight unique achievements or skills that set the applicant apart
-    - Ensure that the applicants management and leadership skills are highlighted. 
-
-    5. Craft a tailored resume:
-    - Use a clear and professional format
-    - Start with a strong summary statement that aligns with the job position
-    - Organize work experience in reverse chronological order, emphasizing relevant roles
-    - Use bullet points to detail responsibilities and achievements, quantifying results where possible
-    - Include relevant skills, certifications, and education that match the job requirements
-    - Keep the same formatting style as the original resume
-
-    6. Follow this structure for the resume, ensuring it fits on at most 2 pages:
-    - Contact Information
-    - Summary Statement (2-3 sentences)
-    - Work Experience (most recent first)
-    - Skills
-    - Education
-    - Certifications (if applicable)
-
-    7. Review and refine the resume:
-    - Ensure all key points from the job description are addressed
-
-    8. Output the final resume:
-    - Write the complete resume within <resume> tags, formatted as it would appear in a formal document.
-
-    Remember to maintain the applicant's voice and style while elevating the content to match the position being applied for. 
-    The resume should be concise, compelling, and tailored specifically to the company and position described, but do not 
-    over embellish information that is not present in the original resume.
-    """
+    return (
+        f"{generate_applicant_materials(APPLICANT_RESUME)}\n\n"
+        f"{RESUME_INSTRUCTIONS}\n"
+        f"{generate_job_context(JOB_DESCRIPTION, COMPANY_INFORMATION)}"
+    )
 
 def generate_cover_letter_prompt(
     JOB_DESCRIPTION: str,
@@ -114,59 +177,99 @@ def generate_cover_letter_prompt(
     Returns:
         str: The prompt for generating a customized cover letter.
     """
+    return (
+        f"{generate_applicant_materials(APPLICANT_RESUME, APPLICANT_PREVIOUS_COVER_LETTER)}\n\n"
+        f"{COVER_LETTER_INSTRUCTIONS}\n"
+        f"{generate_job_context(JOB_DESCRIPTION, COMPANY_INFORMATION)}"
+    )
+
+
+## structured prompts for provider-side prompt caching:
+## everything that is the same for every job (system prompt, applicant resume,
+## previous cover letter and task instructions) goes first and is marked with
+## cache_control, only the job description and company information that follow
+## change from call to call
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+TASK_INSTRUCTIONS = {
+    "resume": RESUME_INSTRUCTIONS,
+    "cover_letter": COVER_LETTER_INSTRUCTIONS,
+}
+
+
+def generate_static_system_blocks(
+    APPLICANT_RESUME: str,
+    APPLICANT_PREVIOUS_COVER_LETTER: str
+) -> list:
+    """
+    Builds the cacheable system prompt: the customizer role followed by the
+    applicant's resume and previous cover letter. It is identical for every
+    job and for both the resume and cover letter requests.
+
+    Args:
+        applicant_resume (str): The applicant's resume.
+        previous_cover_letter (str): The applicant's previous cover letter.
+
+    Returns:
+        list: system content blocks, the last one marked for prompt caching.
+    """
+    applicant_materials = generate_applicant_materials(APPLICANT_RESUME, APPLICANT_PREVIOUS_COVER_LETTER)
+    return [
+        {"type": "text", "text": generate_system_prompt()},
+        {"type": "text", "text": applicant_materials, "cache_control": CACHE_CONTROL},
+    ]
+
+
+def generate_job_context(
+    JOB_DESCRIPTION: str,
+    COMPANY_INFORMATION: str
+) -> str:
+    """
+    Builds the per-job suffix of a structured prompt.
+
+    Args:
+        job_description (str): The job posting details.
+        company_information (str): Information about the company.
+
+    Returns:
+        str: The job description and company information in tags.
+    """
+    return (
+        f"<job_description>\n{JOB_DESCRIPTION}\n</job_description>\n\n"
+        f"<company_information>\n{COMPANY_INFORMATION}\n</company_information>"
+    )
+
 
-    prompt = f"""You are an expert cover letter writer specializing in crafting cover letters for Data Science Managers working within enterprise functions for a financial institution. Your task is to write a tailored cover letter for a specific job posting. You will have the applicants resume, and the job posting details to inform the cover letter. Follow these steps carefully:
-    1. Review the job description and company information:
-    <job_description>
-    {JOB_DESCRIPTION}
-    </job_description>
-
-    <company_information>
-    {COMPANY_INFORMATION}
-    </company_information>
-
-    2. Review the applicant's resume and previous cover letter:
-    <applicant_resume>
-    {APPLICANT_RESUME}
-    </applicant_resume>
-
-    <previous_cover_letter>
-    {APPLICANT_PREVIOUS_COVER_LETTER}
-    </previous_cover_letter>
-
-    3. Analyze the job description and company information:
-    - Identify key requirements for the job position
-    - Note the company's core values
-    - Highlight any specific skills or experiences emphasized in the job posting
-
-    4. Analyze the applicant's resume and previous cover letter:
-    - Identify relevant experiences and qualifications that match the job requirements
-    - Note the applicant's writing style and tone from their previous cover letter
-    - Highlight unique achievements or skills that set the applicant apart
-    - Ensure that the applicants management and leadership skills are highlighted. 
-
-    5. Craft a tailored cover letter:
-    - Address the letter to the appropriate person or department
-    - Open with a strong, attention-grabbing introduction
-    - Align the applicant's qualifications with the positions requirements 
-    - Demonstrate knowledge of the company and enthusiasm for the position
-    - Use specific examples from the applicant's experience to illustrate their suitability
-    - Maintain a professional yet personable tone throughout
-
-    6. Follow this structure for the cover letter, the cover letter must fit on a single page:
-    - Introduction (1 paragraph)
-    - Body (2 paragraphs)
-    - Conclusion (1 paragraph)
-
-    7. Review and refine the cover letter:
-    - Ensure all key points from the job description are addressed
-    - Check that the companies values and core job responsibilities are reflected
-    - Verify that the applicant's strengths are effectively communicated 
-    - Proofread for grammar, spelling, and punctuation errors
-
-    8. Output the final cover letter:
-    Write the complete cover letter within <cover_letter> tags, formatted as it would appear in a formal document.
-
-    Remember to maintain the applicant's voice and style while elevating the content to match the position being applied for. The cover letter should be concise, compelling, and tailored specifically to the company and position described.
+def build_cached_request(
+    kind: str,
+    JOB_DESCRIPTION: str,
+    COMPANY_INFORMATION: str,
+    APPLICANT_RESUME: str,
+    APPLICANT_PREVIOUS_COVER_LETTER: str
+) -> dict:
+    """
+    Builds a messages API request with a stable, cache-marked prefix
+    (system prompt, applicant materials, task instructions) followed by the
+    per-job suffix.
+
+    Args:
+        kind (str): "resume" or "cover_letter".
+        job_description (str): The job posting details.
+        company_information (str): Information about the company.
+        applicant_resume (str): The applicant's resume.
+        previous_cover_letter (str): The applicant's previous cover letter.
+
+    Returns:
+        dict: `system` and `messages` arguments for messages.create.
     """
-    return prompt
+    return {
+        "system": generate_static_system_blocks(APPLICANT_RESUME, APPLICANT_PREVIOUS_COVER_LETTER),
+        "messages": [{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": TASK_INSTRUCTIONS[kind], "cache_control": CACHE_CONTROL},
+                {"type": "text", "text": generate_job_context(JOB_DESCRIPTION, COMPANY_INFORMATION)},
+            ],
+        }],
+    }
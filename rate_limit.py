@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+per-host token bucket rate limiting shared by the
+sequential and asyncio fetch paths, optionally shared
+between processes through a SQLite file
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at `rate` tokens per second up to `capacity`.
+
+    Callers reserve a token up front and are told how long to wait for it, so
+    concurrent callers queue fairly instead of all waking at once.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        # caller holds the lock
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return the number of seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def adjust_rate(self, slow_down: bool, min_rate: float, max_rate: float, step: float) -> float:
+        """
+        AIMD update: halve the rate (not below `min_rate`) when slowing down,
+        otherwise add `step` (up to `max_rate`). Tokens earned at the old rate
+        are credited first. Returns the new rate.
+        """
+        with self._lock:
+            self._refill()
+            if slow_down:
+                self.rate = max(min_rate, self.rate / 2)
+            else:
+                self.rate = min(max_rate, self.rate + step)
+            return self.rate
+
+    def acquire(self):
+        """Block the current thread until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait on the event loop until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """Keeps one TokenBucket per host so each site gets its own request budget."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _new_bucket(self, host: str) -> TokenBucket:
+        return TokenBucket(self.rate, self.capacity)
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Return the bucket for the host of `url`, creating it on first use."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = self._new_bucket(host)
+            return self._buckets[host]
+
+    def acquire(self, url: str):
+        self.bucket(url).acquire()
+
+    async def acquire_async(self, url: str):
+        await self.bucket(url).acquire_async()
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    TokenBucket whose rate and tokens are a row in the SQLite file of a
+    SharedHostRateLimiter, updated in a write transaction, so every process
+    using the file draws from (and AIMD-adjusts) one budget for the host.
+    """
+
+    def __init__(self, limiter: 'SharedHostRateLimiter', host: str):
+        super().__init__(limiter.rate, limiter.capacity)
+        self.limiter = limiter
+        self.host = host
+
+    def _load(self, now: float):
+        # caller holds the write transaction; returns the rate and refilled tokens
+        row = self.limiter.conn.execute(
+            'SELECT rate, tokens, updated FROM rate_buckets WHERE host = ?', (self.host,)).fetchone()
+        if row is None:
+            return self.limiter.rate, self.capacity
+        rate, tokens, updated = row
+        return rate, min(self.capacity, tokens + max(now - updated, 0) * rate)
+
+    def _save(self, rate: float, tokens: float, now: float):
+        self.limiter.conn.execute("""
+            INSERT INTO rate_buckets (host, rate, tokens, updated) VALUES (?, ?, ?, ?)
+            ON CONFLICT(host) DO UPDATE SET rate = excluded.rate, tokens = excluded.tokens, updated = excluded.updated
+        """, (self.host, rate, tokens, now))
+        self.rate = rate
+
+    def reserve(self) -> float:
+        def take():
+            now = time.time()
+            rate, tokens = self._load(now)
+            self._save(rate, tokens - 1, now)
+            return 0.0 if tokens >= 1 else (1 - tokens) / rate
+        return self.limiter.transaction(take)
+
+    def adjust_rate(self, slow_down: bool, min_rate: float, max_rate: float, step: float) -> float:
+        def adjust():
+            now = time.time()
+            rate, tokens = self._load(now)
+            rate = max(min_rate, rate / 2) if slow_down else min(max_rate, rate + step)
+            self._save(rate, tokens, now)
+            return rate
+        return self.limiter.transaction(adjust)
+
+
+class SharedHostRateLimiter(HostRateLimiter):
+    """
+    HostRateLimiter whose per-host buckets live in a SQLite file, so
+    processes behind one egress ip (e.g. frontier workers) share the
+    configured rate: a worker with nothing to do leaves the whole budget
+    to the busy ones instead of holding back a fixed slice of it.
+    """
+
+    def __init__(self, path: str, rate: float, capacity: float = 1.0):
+        super().__init__(rate, capacity)
+        self.path = path
+        # autocommit mode, transactions are opened explicitly
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA busy_timeout=30000')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                host TEXT PRIMARY KEY,
+                rate REAL NOT NULL,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self._db_lock = threading.Lock()
+
+    def _new_bucket(self, host: str) -> TokenBucket:
+        return SharedTokenBucket(self, host)
+
+    def transaction(self, fn):
+        """Run `fn` inside a write transaction on the shared file and return its result."""
+        with self._db_lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn()
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            return result
+
+    def reset(self):
+        """Forget stored rates and tokens, so the next run starts from the configured rate."""
+        self.transaction(lambda: self.conn.execute('DELETE FROM rate_buckets'))
+
+    def close(self):
+        self.conn.close()
+
+
+def limiter_from_config(config: dict, shared_path: str = None) -> HostRateLimiter:
+    """
+    Build a HostRateLimiter from the `scraper` section of the config.
+
+    Args:
+        config (dict): parsed config2.yaml.
+        shared_path (str): SQLite file holding the buckets, for processes that
+            share the configured per-host rate; None keeps them in memory.
+    """
+    scraper = config.get('scraper') or {}
+    rate = scraper.get('requests_per_second', 0.5)
+    capacity = scraper.get('burst', 1)
+    if shared_path:
+        return SharedHostRateLimiter(shared_path, rate, capacity)
+    return HostRateLimiter(rate=rate, capacity=capacity)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+BM25 relevance ranking of scraped postings against the resume, so only
+the best matching jobs are sent to generation
+"""
+import hashlib
+import os
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import List, Optional
+
+import numpy as np
+from scipy import sparse
+
+_TERM = re.compile(r'[a-z0-9][a-z0-9+#]+')
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could do does
+for from had has have he her his how i if in into is it its may more most must no not of on
+or our out over own she should so such than that the their them then there these they this
+those through to under up us very was we were what when where which while who will with would
+you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms of two or more characters without stopwords; keeps tokens like c++ and c#."""
+    return [term for term in _TERM.findall(text.lower()) if term not in STOPWORDS]
+
+
+def corpus_fingerprint(jobs: List[dict]) -> str:
+    """Identifies a job set so a persisted index is only reused for the same postings."""
+    digest = hashlib.sha256()
+    for job in jobs:
+        digest.update(job.get('job_url', '').encode('utf-8'))
+        digest.update(job.get('job_description', '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """
+    Sparse BM25 index over job descriptions.
+
+    The per-term BM25 weights of every document are precomputed into one
+    CSR matrix, so scoring a query is a single sparse matrix-vector product.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab = {}
+        self.weights = None
+        self.fingerprint = None
+
+    def fit(self, texts: List[str], fingerprint: str = None):
+        # unseen terms get the next column id on first lookup
+        vocab = defaultdict(None, self.vocab)
+        vocab.default_factory = vocab.__len__
+        doc_terms = [tokenize(text) for text in texts]
+        lengths = np.fromiter(map(len, doc_terms), dtype=np.int64, count=len(doc_terms))
+        cols = np.fromiter(map(vocab.__getitem__, chain.from_iterable(doc_terms)),
+                           dtype=np.int32, count=int(lengths.sum()))
+        self.vocab = dict(vocab)
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        n_docs, n_terms = len(texts), len(vocab)
+        # duplicate entries within a row are summed into term frequencies
+        tf = sparse.csr_matrix((np.ones(len(cols), dtype=np.float32), cols, indptr),
+                               shape=(n_docs, n_terms))
+        tf.sum_duplicates()
+
+        df = np.bincount(tf.indices, minlength=n_terms)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        doc_len = np.asarray(tf.sum(axis=1)).ravel()
+        avg_len = doc_len.mean() if n_docs and doc_len.mean() else 1.0
+
+        # bm25 term weight: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg_len))
+        norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+        row_norm = np.repeat(norm, np.diff(tf.indptr))
+        tf.data = idf[tf.indices] * tf.data * (self.k1 + 1) / (tf.data + row_norm)
+        self.weights = tf
+        self.fingerprint = fingerprint
+        return self
+
+    def query_vector(self, text: str) -> np.ndarray:
+        """Query term weights, dampened with log(1 + count) since the query is a whole resume."""
+        vector = np.zeros(len(self.vocab), dtype=np.float32)
+        for term, count in Counter(tokenize(text)).items():
+            col = self.vocab.get(term)
+            if col is not None:
+                vector[col] = np.log1p(count)
+        return vector
+
+    def score(self, text: str) -> np.ndarray:
+        """BM25 score of every indexed document against `text`."""
+        if self.weights is None or not self.vocab:
+            return np.zeros(0 if self.weights is None else self.weights.shape[0], dtype=np.float32)
+        return self.weights @ self.query_vector(text)
+
+    def save(self, path):
+        terms = np.empty(len(self.vocab), dtype=object)
+        for term, col in self.vocab.items():
+            terms[col] = term
+        np.savez(
+            path, data=self.weights.data, indices=self.weights.indices, indptr=self.weights.indptr,
+            shape=np.array(self.weights.shape), terms=terms.astype(str),
+            params=np.array([self.k1, self.b]), fingerprint=np.array(self.fingerprint or ''),
+        )
+
+    @classmethod
+    def load(cls, path) -> Optional['BM25Index']:
+        """Load a saved index, or return None when the file is missing or unreadable."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as saved:
+                index = cls(*saved['params'].tolist())
+                index.weights = sparse.csr_matrix(
+                    (saved['data'], saved['indices'], saved['indptr']), shape=tuple(saved['shape']))
+                index.vocab = {term: col for col, term in enumerate(saved['terms'].tolist())}
+                index.fingerprint = str(saved['fingerprint']) or None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable relevance index {path}: {e}")
+            return None
+        return index
+
+
+def rank_jobs(jobs: List[dict], resume: str, top_k: int = None, min_score: float = 0.0,
+              index_path: str = None) -> List[int]:
+    """
+    Indices of the jobs to keep, best match first.
+
+    Args:
+        jobs (List[dict]): scraped job details.
+        resume (str): resume text used as the query.
+        top_k (int): keep at most this many jobs; None keeps all that pass min_score.
+        min_score (float): minimum score relative to the best match, between 0 and 1;
+            ignored when no job shares a term with the resume.
+        index_path (str): optional .npz file the index is persisted to and reused from
+            while the job set is unchanged.
+
+    Returns:
+        List[int]: selected job indices ordered by descending score.
+    """
+    if not jobs:
+        return []
+    fingerprint = corpus_fingerprint(jobs)
+    index = BM25Index.load(index_path) if index_path else None
+    if index is None or index.fingerprint != fingerprint:
+        index = BM25Index().fit([f"{job.get('job_name', '')} {job.get('job_description', '')}" for job in jobs],
+                                fingerprint)
+        if index_path:
+            index.save(index_path)
+
+    scores = index.score(resume)
+    best = scores.max() if scores.size else 0.0
+    order = np.argsort(-scores, kind='stable')
+    # with no overlap at all the scores carry no signal, so only top_k applies
+    selected = [int(i) for i in order if best <= 0 or scores[i] >= min_score * best]
+    return selected[:top_k] if top_k else selected
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+crash-safe JSONL output for scraped jobs, with a checkpoint
+file for resuming interrupted runs and export to job_results.json
+"""
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+
+def read_jsonl(path) -> Iterator[dict]:
+    """Yield records from a JSONL file, skipping a torn last line left by a crash."""
+    path = Path(path)
+    if not path.exists():
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping incomplete record in {path}")
+
+
+def export_json(jsonl_path, json_path='job_results.json') -> int:
+    """
+    Compact a JSONL results file into the job_results.json list format,
+    keeping the latest record for each job_url.
+
+    Returns:
+        int: number of jobs written.
+    """
+    latest = {}
+    for record in read_jsonl(jsonl_path):
+        latest.pop(record['job_url'], None)
+        latest[record['job_url']] = record
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(list(latest.values()), f, indent=2, ensure_ascii=False)
+    print(f"Saved {len(latest)} jobs to {json_path}")
+    return len(latest)
+
+
+class JsonlResultWriter:
+    """
+    Appends one JSON line per scraped job, flushed and fsynced as it
+    finishes, next to a small checkpoint file recording whether the last
+    run completed. A run that finds a 'running' checkpoint resumes by
+    skipping jobs already in the JSONL; otherwise it starts a fresh file
+    when its first job is written, so a run that finds nothing new leaves
+    the previous results in place.
+    """
+
+    def __init__(self, jsonl_path='job_results.jsonl', checkpoint_path=None):
+        self.jsonl_path = Path(jsonl_path)
+        self.checkpoint_path = Path(checkpoint_path or self.jsonl_path.with_suffix('.checkpoint.json'))
+        self.completed = 0
+        self._file = None
+        self._mode = 'w'
+
+    def load_checkpoint(self) -> dict:
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_checkpoint(self, status: str, last_job_url: str = None):
+        checkpoint = {
+            'status': status,
+            'jsonl_path': str(self.jsonl_path),
+            'completed': self.completed,
+            'last_job_url': last_job_url,
+            'updated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        tmp = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp, self.checkpoint_path)
+
+    def open(self) -> set:
+        """
+        Start or resume a run.
+
+        Returns:
+            set: job urls already written by an interrupted previous run (empty for a fresh run).
+        """
+        resuming = self.load_checkpoint().get('status') == 'running'
+        done = {record['job_url'] for record in read_jsonl(self.jsonl_path)} if resuming else set()
+        if resuming:
+            print(f"Resuming interrupted run, {len(done)} jobs already saved in {self.jsonl_path}")
+            self._truncate_torn_line()
+        self.completed = len(done)
+        self._mode = 'a' if resuming else 'w'
+        self._write_checkpoint('running')
+        return done
+
+    def _truncate_torn_line(self):
+        """Cut a partial last line left by a crash so the next append starts on a fresh line."""
+        if not self.jsonl_path.exists():
+            return
+        with open(self.jsonl_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            # walk back in blocks to just after the last newline
+            while end > 0:
+                start = max(end - 4096, 0)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end < size:
+                print(f"Dropping incomplete last record in {self.jsonl_path}")
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append(self, record: dict):
+        if self._file is None:
+            self._file = open(self.jsonl_path, self._mode, encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.completed += 1
+        self._write_checkpoint('running', record.get('job_url'))
+
+    def close(self, complete: bool = True):
+        """Close the JSONL file; only a complete run clears the resume checkpoint."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if complete:
+            self._write_checkpoint('complete')
@@ -3,13 +3,17 @@
 Resume and Cover Letter Customizer
 Takes job results and creates customized application materials for each job posting using AI prompts.
 """
-import os, sys,  json, anthropic
-from IPython.display import Markdown, display
+import os, sys,  json
 from pathlib import Path
 from urllib.parse import urlparse
 #customs
+#numpy/scipy (ranking, dedup) and anthropic (generation) are imported in run() when needed
+from app_config import load_config
 from utils import load_docx_text 
-from prompts import generate_system_prompt, generate_cover_letter_prompt, generate_resume_prompt
+from boilerplate import BoilerplateDetector
+import metrics
+from token_budget import TokenBudget, estimate_request_tokens, estimate_tokens, project_run, format_projection
+from prompts import generate_system_prompt, generate_cover_letter_prompt, generate_resume_prompt, build_cached_request, generate_static_system_blocks
 from pydantic import BaseModel, HttpUrl, AnyUrl, field_validator, FilePath
 from typing import Dict, Union, List
 
@@ -19,7 +23,7 @@ class JobResult(BaseModel):
     company: str
     job_description: str
     additional_info: str
-    key_requirements: dict 
+    key_requirements: dict = {}
 
     @field_validator('job_url')
     def validate_url(cls,v):
@@ -57,92 +61,239 @@ def main(linked_in_results_path:dict
     pass
 
 
-if __name__ == "__main__":
+def show_markdown(text: str):
+    """Render markdown when running inside a notebook, print it otherwise."""
+    if 'ipykernel' in sys.modules:
+        from IPython.display import Markdown, display
+        display(Markdown(text))
+    else:
+        print(text)
+
+
+def run(config: dict, dry_run: bool = False, jobs_path: str = None, output_path: str = None):
+    """
+    Generate customized resumes and cover letters for the scraped jobs.
+
+    Args:
+        config (dict): parsed config2.yaml.
+        dry_run (bool): validate inputs, build the prompts and print the token/cost
+            projection without calling the API.
+        jobs_path (str): scraped jobs, defaults to job_search.output_path.
+        output_path (str): results file, defaults to generation.output_path.
+
+    Returns:
+        list: the saved application records (empty on a dry run).
+    """
+    from dedup import representatives
+    from relevance import rank_jobs
 
     #root path
     _root = Path.cwd()
-    linked_in_job_results_path = _root / "job_results.json"
-    coverletter_path = "C:/Users/zjc10/OneDrive/Personal/Resume/CoverLetter - USAA Director AI_ML (Model Development).docx"
-    resume_path = "C:/Users/zjc10/OneDrive/Personal/Resume/Zach Carideo Resume 2025 v2.docx"
+    metrics.metrics_from_config(config)
+    linked_in_job_results_path = _root / (jobs_path or config['job_search'].get('output_path') or "job_results.json")
+    coverletter_path = config['user_resume_cv']['coverletter_path']
+    resume_path = config['user_resume_cv']['resume_path']
 
     file_validator = resume_and_cv(
         resume_path=resume_path,
         coverletter_path=coverletter_path
     )
 
-    #coverletter & resume 
+    #coverletter & resume, parsed once and cached until the files change
     coverletter = load_docx_text(file_validator.coverletter_path)
-    resume = load_docx_text(file_validator.resume_path)
+    resume = load_docx_text(file_validator.resume_path, config['user_resume_cv'].get('resume_sections'))
 
     #load scrapped job details 
     with open(linked_in_job_results_path, 'r', encoding='utf-8') as f:
         jobs = json.load(f)
 
+    #strip boilerplate repeated across postings (EEO, benefits, about us) before prompting;
+    #the detector learns from every scraped job, not just the ones selected below
+    boilerplate = config.get('boilerplate') or {}
+    if boilerplate.get('enabled', True):
+        boilerplate_state_path = _root / boilerplate.get('path', "boilerplate_state.json")
+        detector = BoilerplateDetector.load(
+            boilerplate_state_path,
+            min_jobs=boilerplate.get('min_jobs', 3),
+            min_company_jobs=boilerplate.get('min_company_jobs', 2),
+            min_chars=boilerplate.get('min_chars', 30),
+            max_strip_fraction=boilerplate.get('max_strip_fraction', 0.7),
+        )
+        report = detector.strip_jobs(jobs)
+        detector.save(boilerplate_state_path)
+        print(f"Removed {report['chars_removed']} chars (~{report['tokens_removed']} tokens) "
+              f"of boilerplate from {report['jobs']} job descriptions")
+
+    #rank postings against the resume and only generate for the best matches
+    ranking = config.get('ranking') or {}
+    if ranking.get('enabled', True):
+        _selected = rank_jobs(
+            jobs,
+            resume,
+            top_k=ranking.get('top_k'),
+            min_score=ranking.get('min_score', 0.0),
+            index_path=ranking.get('index_path'),
+        )
+        print(f"Kept {len(_selected)} of {len(jobs)} jobs after relevance ranking")
+        jobs = [jobs[_i] for _i in _selected]
+
+    #cluster near-duplicate postings (reposts, same role found by several searches)
+    #so materials are generated once per cluster and reused for the rest; this runs
+    #on the stripped descriptions so shared EEO/benefits text does not make
+    #different roles at the same company look alike
+    dedup = config.get('dedup') or {}
+    if dedup.get('enabled', True):
+        job_representative = representatives(jobs, threshold=dedup.get('threshold', 0.8))
+        print(f"{len(set(job_representative))} unique postings out of {len(jobs)} jobs")
+    else:
+        job_representative = list(range(len(jobs)))
+
+    generation = config.get('generation') or {}
+    prompt_caching = generation.get('prompt_caching', True)
+    system_prompt = generate_system_prompt()
+
+    #size every request before sending it; long descriptions lose their lowest-value
+    #sections and requests that still do not fit are reported instead of sent
+    budget_config = generation.get('budget') or {}
+    max_tokens = generation.get('max_tokens', 2000)
+    budget = TokenBudget(
+        max_input_tokens=budget_config.get('max_input_tokens', 20000),
+        max_output_tokens=max_tokens,
+        context_window=budget_config.get('context_window', 200000),
+    )
+
     _results = []
-    for _d in jobs: 
+    _prompts = []
+    _input_tokens = []
+    _oversized = {}
+    _trimmed_tokens = 0
+    for _i, _d in enumerate(jobs): 
+        #near-duplicates are filled in from their representative below
+        if job_representative[_i] != _i:
+            continue
+
         #unpack job details and validate
         job = JobResult(**_d)
         job_description = _d['job_description']
-        company_information = _d['company_information']
+        company_information = _d.get('company_information') or _d['company']
 
-        #generate resume prompt 
-        resume_prompt = generate_resume_prompt(
-            JOB_DESCRIPTION=job_description,
-            COMPANY_INFORMATION=company_information,
-            APPLICANT_RESUME=resume
-        )
+        #structured requests keep the resume, previous cover letter and instructions
+        #as a cached prefix so only the job specific suffix is billed at full price
+        if prompt_caching:
+            build_resume = lambda desc: build_cached_request("resume", desc, company_information, resume, coverletter)
+            build_cover_letter = lambda desc: build_cached_request("cover_letter", desc, company_information, resume, coverletter)
+        else:
+            build_resume = lambda desc: generate_resume_prompt(
+                JOB_DESCRIPTION=desc,
+                COMPANY_INFORMATION=company_information,
+                APPLICANT_RESUME=resume
+            )
+            build_cover_letter = lambda desc: generate_cover_letter_prompt(
+                JOB_DESCRIPTION=desc,
+                COMPANY_INFORMATION=company_information,
+                APPLICANT_RESUME=resume,
+                APPLICANT_PREVIOUS_COVER_LETTER=coverletter
+            )
 
-        #generate cover letter prompt 
-        cover_letter_prompt = generate_cover_letter_prompt(
-            JOB_DESCRIPTION=job_description,
-            COMPANY_INFORMATION=company_information,
-            APPLICANT_RESUME=resume,
-            APPLICANT_PREVIOUS_COVER_LETTER=coverletter
-        )
+        with metrics.timer('prompt_render_seconds', kind='resume'):
+            resume_prompt, resume_info = budget.fit(build_resume, job_description, system_prompt)
+        with metrics.timer('prompt_render_seconds', kind='cover_letter'):
+            cover_letter_prompt, cover_letter_info = budget.fit(build_cover_letter, job_description, system_prompt)
+        if resume_info['oversized'] or cover_letter_info['oversized']:
+            _oversized[_i] = max(resume_info['input_tokens'], cover_letter_info['input_tokens'])
+            continue
+        _trimmed_tokens += resume_info['trimmed_tokens'] + cover_letter_info['trimmed_tokens']
+        _input_tokens += [resume_info['input_tokens'], cover_letter_info['input_tokens']]
+        _prompts.append((_i, resume_prompt, cover_letter_prompt))
 
-        #print prompts for debugging 
-        display(Markdown("### Resume Prompt"))
-        display(Markdown(resume_prompt))
-        display(Markdown("### Cover Letter Prompt"))
-        display(Markdown(cover_letter_prompt))
-
-        #call anthropic api to get response 
-        client = anthropic.Client(os.getenv("ANTHROPIC_API_KEY"))
-
-        #get resume response 
-        resume_response = client.completions.create(
-            model="claude-2",
-            max_tokens=2000,
-            temperature=0.7,
-            top_p=1,
-            prompt=f"{generate_system_prompt()}\n\nHuman: {resume_prompt}\n\nAssistant:"
-        )
+    if _trimmed_tokens:
+        print(f"Trimmed ~{_trimmed_tokens} tokens of low-value description text to fit the input budget")
+    if _oversized:
+        print(f"Skipping {len(_oversized)} postings over the {budget.input_limit} token input budget")
 
-        #get cover letter response 
-        cover_letter_response = client.completions.create(
-            model="claude-2",
-            max_tokens=2000,
-            temperature=0.7,
-            top_p=1,
-            prompt=f"{generate_system_prompt()}\n\nHuman: {cover_letter_prompt}\n\nAssistant:"
-        )
+    #worst case projection before any tokens are spent
+    _prefix_tokens = estimate_tokens("\n".join(
+        block['text'] for block in generate_static_system_blocks(resume, coverletter))) if prompt_caching else 0
+    _projection = project_run(
+        _input_tokens,
+        max_output_tokens=max_tokens,
+        prices=budget_config.get('price_per_mtok') or {},
+        concurrency=generation.get('concurrency', 4),
+        latency_seconds=budget_config.get('expected_latency_seconds', 30),
+        cached_prefix_tokens=_prefix_tokens,
+    )
+    print(f"Projected run: {format_projection(_projection)}")
+    if dry_run:
+        for _i, resume_prompt, cover_letter_prompt in _prompts:
+            print(f"{jobs[_i]['job_name']} at {jobs[_i]['company']}: resume ~{estimate_request_tokens(resume_prompt, system_prompt)} "
+                  f"tokens, cover letter ~{estimate_request_tokens(cover_letter_prompt, system_prompt)} tokens")
+        return []
+
+    from batch_generation import BatchGenerator
+    from llm_cache import LLMResponseCache
+
+    #unchanged jobs, resume and prompts are answered from the local response cache
+    cache_config = generation.get('response_cache') or {}
+    response_cache = LLMResponseCache(
+        cache_config.get('path', 'llm_cache.sqlite'),
+        max_entries=cache_config.get('max_entries'),
+        max_age_days=cache_config.get('max_age_days'),
+    ) if cache_config.get('enabled', True) else None
+    _force = set(generation.get('force_regenerate') or [])
+    _force_keys = {_i for _i, _, _ in _prompts if jobs[_i]['job_url'] in _force}
+
+    #generate every resume/cover letter pair with one shared client and bounded concurrency
+    generator = BatchGenerator(
+        model=generation.get('model', 'claude-sonnet-4-5'),
+        system_prompt=system_prompt,
+        max_tokens=max_tokens,
+        temperature=generation.get('temperature', 0.7),
+        concurrency=generation.get('concurrency', 4),
+        max_retries=generation.get('max_retries', 5),
+        backoff=generation.get('backoff', 2.0),
+        base_url=generation.get('base_url'),
+        cache=response_cache,
+    )
+    _generated = generator.generate(_prompts, _force_keys)
+    _generated.update({_i: {"error": f"~{_tokens} input tokens exceeds the budget"} for _i, _tokens in _oversized.items()})
+    _failed = [jobs[_i]['job_url'] for _i, _r in _generated.items() if 'error' in _r]
+    print(f"Generated materials for {len(_generated) - len(_failed)}/{len(_generated)} unique postings")
+    print(f"Token usage: {generator.usage_report()}")
+    if response_cache is not None:
+        print(f"Response cache: {response_cache.report()}")
+        response_cache.close()
+
+    for _i, _d in enumerate(jobs):
+        _rep = job_representative[_i]
 
         #print responses for debugging 
-        display(Markdown("### Resume Response"))
-        display(Markdown(resume_response.completion))
-        display(Markdown("### Cover Letter Response"))
-        display(Markdown(cover_letter_response.completion))
+        if _rep == _i and 'error' not in _generated[_rep]:
+            show_markdown(f"### Resume Response: {_d['job_name']} at {_d['company']}")
+            show_markdown(_generated[_rep]['customized_resume'])
+            show_markdown("### Cover Letter Response")
+            show_markdown(_generated[_rep]['customized_cover_letter'])
 
         _results.append({
-            "job_title": _d['job_title'],
-            "company_name": _d['company_name'],
-            "location": _d['location'],
-            "job_posting_url": _d['job_posting_url'],
-            "customized_resume": resume_response.completion,
-            "customized_cover_letter": cover_letter_response.completion
+            "job_title": _d['job_name'],
+            "company_name": _d['company'],
+            "location": _d.get('location'),
+            "job_posting_url": _d['job_url'],
+            **_generated[_rep],
+            **({"duplicate_of": jobs[_rep]['job_url']} if _rep != _i else {})
         })
 
+    if _failed:
+        print(f"Generation failed for {len(_failed)} postings, rerun to retry: {_failed}")
+
     # Save results to JSON file
-    output_file = _root / "customized_applications.json"
+    output_file = _root / (output_path or generation.get('output_path') or "customized_applications.json")
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(_results, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+        json.dump(_results, f, indent=4, ensure_ascii=False)
+    print(f"Saved {len(_results)} applications to {output_file}")
+
+    metrics.write_from_config(config)
+    return _results
+
+
+if __name__ == "__main__":
+    run(load_config())
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the modules under test live flat in the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stub_server import StubServer  # noqa: E402
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+local stand-in for the Anthropic messages API in tests: answers
+POST /v1/messages by echoing the prompt, with configurable latency,
+scripted error statuses and in-flight request tracking
+"""
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ERROR_TYPES = {400: 'invalid_request_error', 429: 'rate_limit_error', 500: 'api_error', 529: 'overloaded_error'}
+
+
+def prompt_text(body: dict) -> str:
+    """Text of the last user message, whether it is a string or content blocks."""
+    content = body['messages'][-1]['content']
+    if isinstance(content, str):
+        return content
+    return ''.join(block.get('text', '') for block in content)
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = prompt_text(body)
+        with server.lock:
+            server.calls.append(body)
+            server.hits[prompt] += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            scripted = server.scripted[prompt]
+            status = scripted.pop(0) if scripted else 200
+        try:
+            time.sleep(server.delay)
+            if status == 200:
+                payload = {
+                    'id': f"msg_{len(server.calls)}",
+                    'type': 'message',
+                    'role': 'assistant',
+                    'model': body['model'],
+                    'content': [{'type': 'text', 'text': f"OUT:{prompt}"}],
+                    'stop_reason': 'end_turn',
+                    'stop_sequence': None,
+                    'usage': {'input_tokens': 100, 'output_tokens': 20,
+                              'cache_creation_input_tokens': 0, 'cache_read_input_tokens': 0},
+                }
+            else:
+                payload = {'type': 'error', 'error': {'type': ERROR_TYPES.get(status, 'api_error'),
+                                                      'message': f"scripted {status}"}}
+            out = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class StubAPIServer(ThreadingHTTPServer):
+    """
+    Threaded messages API stub on a free local port; pass `base_url` to the
+    client. `scripted` maps a prompt to statuses returned, in order, before
+    it is answered with a 200.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(('127.0.0.1', 0), StubAPIHandler)
+        self.lock = threading.Lock()
+        self.delay = delay
+        self.calls = []
+        self.hits = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.scripted = defaultdict(list)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self) -> 'StubAPIServer':
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    server = StubAPIServer(delay=0.3).start()
+    print(f"Serving a stub messages API on {server.base_url}, set generation.base_url to it. Ctrl+C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
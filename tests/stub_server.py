@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+local HTTP server standing in for LinkedIn in tests: serves pages with
+configurable latency and scripted error statuses, and records how many
+requests were in flight at once
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        path = urlsplit(self.path).path
+        with server.lock:
+            server.hits[path] += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            scripted = server.scripted[path]
+            status = scripted.pop(0) if scripted else 200
+        try:
+            time.sleep(server.delays.get(path, server.default_delay))
+            body = f"<html><body><h1>{path}</h1></body></html>".encode('utf-8') if status == 200 else b''
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server on a free local port.
+
+    `delays` maps a path to its response latency (default `default_delay`),
+    `scripted` maps a path to statuses served, in order, before it returns
+    the page with a 200.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, default_delay: float = 0.0):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.default_delay = default_delay
+        self.delays = {}
+        self.scripted = defaultdict(list)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    server = StubServer(default_delay=0.2).start()
+    print(f"Serving stub pages on {server.base_url}, Ctrl+C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,63 @@
+import pytest
+
+from batch_generation import BatchGenerator
+from stub_api import StubAPIServer
+
+
+@pytest.fixture
+def stub_api():
+    server = StubAPIServer().start()
+    yield server
+    server.stop()
+
+
+def make_generator(stub_api, **kwargs) -> BatchGenerator:
+    # no backoff keeps retries instant against the stub
+    kwargs.setdefault('concurrency', 4)
+    return BatchGenerator(model='stub-model', system_prompt='system', max_tokens=100,
+                          max_retries=2, backoff=0.0, api_key='test', base_url=stub_api.base_url, **kwargs)
+
+
+def job(key) -> tuple:
+    return key, f"resume {key}", f"cover letter {key}"
+
+
+def test_results_match_their_jobs(stub_api):
+    stub_api.delay = 0.01
+    jobs = [job(i) for i in range(6)]
+    results = make_generator(stub_api).generate(jobs)
+
+    assert set(results) == set(range(6))
+    for key in range(6):
+        assert results[key] == {'customized_resume': f"OUT:resume {key}",
+                                'customized_cover_letter': f"OUT:cover letter {key}"}
+
+
+def test_concurrency_cap(stub_api):
+    stub_api.delay = 0.05
+    generator = make_generator(stub_api, concurrency=2)
+    generator.generate([job(i) for i in range(6)])
+
+    assert len(stub_api.calls) == 12
+    assert 1 < stub_api.max_in_flight <= 2
+
+
+def test_429_is_retried(stub_api):
+    stub_api.scripted['resume 1'] = [429]
+    generator = make_generator(stub_api)
+    results = generator.generate([job(1)])
+
+    assert results[1]['customized_resume'] == 'OUT:resume 1'
+    assert stub_api.hits['resume 1'] == 2
+    assert generator.usage['requests'] == 2
+
+
+def test_partial_failure(stub_api):
+    # 400 is not retryable: the job fails, the rest of the batch goes through
+    stub_api.scripted['cover letter 2'] = [400]
+    results = make_generator(stub_api).generate([job(i) for i in range(4)])
+
+    assert 'error' in results[2]
+    assert stub_api.hits['cover letter 2'] == 1
+    for key in (0, 1, 3):
+        assert results[key]['customized_cover_letter'] == f"OUT:cover letter {key}"
@@ -0,0 +1,77 @@
+from boilerplate import BoilerplateDetector, split_segments
+
+EEO = "We are an equal opportunity employer and value diversity at our company."
+ABOUT = "Acme builds forecasting tools used by thousands of retailers worldwide."
+
+
+def job(url: str, company: str, *sentences: str) -> dict:
+    return {'job_url': url, 'company': company, 'job_description': ' '.join(sentences)}
+
+
+def test_split_segments_handles_glued_sentences_and_bullets():
+    text = "Benefits:• Health insurance•Dental\nApply now!Great team. we are 3 people"
+    assert split_segments(text) == ['Benefits:', 'Health insurance', 'Dental', 'Apply now!',
+                                    'Great team. we are 3 people']
+
+
+def test_text_without_boilerplate_is_returned_unchanged():
+    jobs = [job(f"u{i}", f"C{i}", f"Role number {i} analyses demand data for the planning team.") for i in range(3)]
+    # irregular spacing must survive when nothing is stripped
+    jobs[0]['job_description'] = "Build  models.\n\nShip   them to production every week, reliably."
+    original = jobs[0]['job_description']
+
+    report = BoilerplateDetector().strip_jobs(jobs)
+
+    assert jobs[0]['job_description'] == original
+    assert report['chars_removed'] == 0
+
+
+def test_removed_chars_count_only_dropped_segments():
+    specific = [f"Role number {i} analyses demand data for the planning team." for i in range(3)]
+    jobs = [job(f"u{i}", f"C{i}", specific[i], EEO) for i in range(3)]
+
+    report = BoilerplateDetector().strip_jobs(jobs)
+
+    assert [j['job_description'] for j in jobs] == specific
+    assert report['chars_removed'] == 3 * len(EEO)
+
+
+def test_frozen_jobs_ignore_boilerplate_learned_later(tmp_path):
+    state = tmp_path / 'boilerplate_state.json'
+    first = job('u1', 'Acme', "Senior data scientist for the pricing team, Python and SQL.", ABOUT)
+    detector = BoilerplateDetector.load(state)
+    detector.strip_jobs([first])
+    detector.save(state)
+    assert first['job_description'].endswith(ABOUT)
+
+    # a second Acme posting makes ABOUT company boilerplate; only the new job loses it
+    jobs = [job('u1', 'Acme', "Senior data scientist for the pricing team, Python and SQL.", ABOUT),
+            job('u2', 'Acme', "Machine learning engineer to run our feature platform.", ABOUT)]
+    detector = BoilerplateDetector.load(state)
+    detector.strip_jobs(jobs)
+
+    assert jobs[0]['job_description'].endswith(ABOUT)
+    assert ABOUT not in jobs[1]['job_description']
+
+
+def test_changed_description_is_stripped_again():
+    detector = BoilerplateDetector()
+    detector.strip_jobs([job('u1', 'Acme', "Senior data scientist for the pricing team.", ABOUT)])
+    assert detector.frozen['u1']['removed'] == []
+
+    edited = job('u1', 'Acme', "Staff data scientist for the pricing team.", ABOUT)
+    detector.strip_jobs([edited, job('u2', 'Acme', "Machine learning engineer to run our platform.", ABOUT)])
+
+    assert edited['job_description'] == "Staff data scientist for the pricing team."
+
+
+def test_frozen_entries_of_jobs_left_out_are_pruned(tmp_path):
+    state = tmp_path / 'boilerplate_state.json'
+    detector = BoilerplateDetector()
+    detector.strip_jobs([job(f"u{i}", 'Acme', f"Posting {i} for the analytics group in Berlin.") for i in range(4)])
+    assert set(detector.frozen) == {'u0', 'u1', 'u2', 'u3'}
+
+    detector.strip_jobs([job('u1', 'Acme', "Posting 1 for the analytics group in Berlin.")])
+    detector.save(state)
+
+    assert set(BoilerplateDetector.load(state).frozen) == {'u1'}
@@ -0,0 +1,49 @@
+from docx import Document
+
+from docx_ingest import load_document, parse_docx
+
+
+def make_resume(path):
+    doc = Document()
+    doc.add_paragraph('Jane Doe', style='Title')
+    doc.add_paragraph('jane@example.com')
+    doc.add_paragraph('Summary')
+    doc.add_paragraph('Data scientist with eight years in retail forecasting.')
+    doc.add_heading('Professional Experience', level=1)
+    doc.add_paragraph('Built demand models for 2,000 stores.', style='List Bullet')
+    doc.add_paragraph('Work History:')
+    doc.add_paragraph('Analyst at Acme, 2015-2018.')
+    doc.add_heading('Technical Skills & Tools', level=1)
+    doc.add_paragraph('Tools: Python, SQL')
+    doc.add_paragraph('Education')
+    doc.add_paragraph("Bachelor's degree in Statistics")
+    doc.save(path)
+    return path
+
+
+def test_sections_follow_styled_and_whole_line_headings(tmp_path):
+    document = parse_docx(make_resume(tmp_path / 'resume.docx'))
+
+    assert document.sections['summary'] == ['Data scientist with eight years in retail forecasting.']
+    assert document.sections['experience'] == ['- Built demand models for 2,000 stores.',
+                                               'Analyst at Acme, 2015-2018.']
+    # content lines that merely mention an alias word stay in their section
+    assert document.sections['skills'] == ['Technical Skills & Tools', 'Tools: Python, SQL']
+    assert document.sections['education'] == ["Bachelor's degree in Statistics"]
+
+
+def test_title_style_text_is_kept(tmp_path):
+    document = parse_docx(make_resume(tmp_path / 'resume.docx'))
+
+    assert document.sections['jane doe'] == ['Jane Doe', 'jane@example.com']
+    assert document.lines[0] == 'Jane Doe'
+
+
+def test_select_returns_only_named_sections(tmp_path):
+    document = load_document(make_resume(tmp_path / 'resume.docx'), cache_dir=str(tmp_path / 'cache'))
+
+    selected = document.select(['skills', 'education'])
+
+    assert 'Tools: Python, SQL' in selected
+    assert "Bachelor's degree in Statistics" in selected
+    assert 'demand models' not in selected
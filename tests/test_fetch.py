@@ -0,0 +1,164 @@
+from async_fetch import fetch_all, iter_fetch, iter_fetch_async
+from http_client import ScraperClient
+from rate_limit import HostRateLimiter
+
+
+def make_client(**kwargs) -> ScraperClient:
+    # a generous rate limit and no backoff keep the tests fast
+    kwargs.setdefault('max_retries', 2)
+    return ScraperClient(limiter=HostRateLimiter(1000, 100), backoff=0.0, timeout=5, **kwargs)
+
+
+def page(path: str) -> bytes:
+    return f"<html><body><h1>{path}</h1></body></html>".encode('utf-8')
+
+
+def test_results_keep_input_order(stub_server):
+    paths = [f"/jobs/view/{i}" for i in range(8)]
+    # earlier urls answer slower, so completion order is the reverse of input order
+    stub_server.delays = {path: 0.02 * (len(paths) - i) for i, path in enumerate(paths)}
+    client = make_client()
+    try:
+        results = list(iter_fetch((stub_server.url(path) for path in paths), client.fetch, concurrency=4))
+    finally:
+        client.close()
+
+    assert [url for url, _ in results] == [stub_server.url(path) for path in paths]
+    assert [body for _, body in results] == [page(path) for path in paths]
+
+
+def test_concurrency_cap(stub_server):
+    stub_server.default_delay = 0.05
+    client = make_client()
+    try:
+        results = list(iter_fetch((stub_server.url(f"/jobs/view/{i}") for i in range(12)),
+                                  client.fetch, concurrency=3))
+    finally:
+        client.close()
+
+    assert len(results) == 12
+    assert 1 < stub_server.max_in_flight <= 3
+
+
+def test_429_is_retried(stub_server):
+    stub_server.scripted['/jobs/view/1'] = [429]
+    client = make_client()
+    try:
+        body = client.fetch(stub_server.url('/jobs/view/1'))
+    finally:
+        client.close()
+
+    assert body == page('/jobs/view/1')
+    assert stub_server.hits['/jobs/view/1'] == 2
+    assert client.stats['throttled'] == 1
+    assert client.stats['retries'] == 1
+
+
+def test_partial_failure(stub_server):
+    stub_server.scripted['/jobs/view/2'] = [404]
+    paths = [f"/jobs/view/{i}" for i in range(5)]
+    client = make_client()
+
+    def worker(url):
+        if url.endswith('/4'):
+            raise ValueError('parse error')
+        return client.fetch(url)
+
+    try:
+        results = dict(iter_fetch((stub_server.url(path) for path in paths), worker, concurrency=2))
+    finally:
+        client.close()
+
+    # a 404 or a failing worker leaves None in its slot without stopping the others
+    assert results[stub_server.url('/jobs/view/2')] is None
+    assert results[stub_server.url('/jobs/view/4')] is None
+    for path in ('/jobs/view/0', '/jobs/view/1', '/jobs/view/3'):
+        assert results[stub_server.url(path)] == page(path)
+    assert stub_server.hits['/jobs/view/2'] == 1
+
+
+async def fetch_body(url, http):
+    return await http.fetch(url)
+
+
+def test_async_results_keep_input_order(stub_server):
+    paths = [f"/jobs/view/{i}" for i in range(8)]
+    stub_server.delays = {path: 0.02 * (len(paths) - i) for i, path in enumerate(paths)}
+    client = make_client()
+    try:
+        results = list(iter_fetch_async((stub_server.url(path) for path in paths), fetch_body, client, concurrency=4))
+    finally:
+        client.close()
+
+    assert [url for url, _ in results] == [stub_server.url(path) for path in paths]
+    assert [body for _, body in results] == [page(path) for path in paths]
+    # the asyncio engine goes through aiohttp, not the requests session
+    assert client.connections_opened() == 0
+    assert client.stats['requests'] == len(paths)
+
+
+def test_async_concurrency_cap(stub_server):
+    stub_server.default_delay = 0.05
+    client = make_client()
+    try:
+        bodies = fetch_all((stub_server.url(f"/jobs/view/{i}") for i in range(12)), fetch_body, client, concurrency=3)
+    finally:
+        client.close()
+
+    assert len(bodies) == 12
+    assert 1 < stub_server.max_in_flight <= 3
+
+
+def test_async_urls_are_pulled_lazily(stub_server):
+    pulled = []
+
+    def links():
+        for i in range(10):
+            pulled.append(i)
+            yield stub_server.url(f"/jobs/view/{i}")
+
+    client = make_client()
+    try:
+        results = iter_fetch_async(links(), fetch_body, client, concurrency=2)
+        next(results)
+        # only a window's worth of urls has been consumed for the first result
+        assert len(pulled) <= 3
+        results.close()
+    finally:
+        client.close()
+
+
+def test_async_429_is_retried(stub_server):
+    stub_server.scripted['/jobs/view/1'] = [429]
+    client = make_client()
+    try:
+        [body] = fetch_all([stub_server.url('/jobs/view/1')], fetch_body, client)
+    finally:
+        client.close()
+
+    assert body == page('/jobs/view/1')
+    assert stub_server.hits['/jobs/view/1'] == 2
+    assert client.stats['throttled'] == 1
+    assert client.stats['retries'] == 1
+
+
+def test_async_partial_failure(stub_server):
+    stub_server.scripted['/jobs/view/2'] = [404]
+    paths = [f"/jobs/view/{i}" for i in range(5)]
+    client = make_client()
+
+    async def worker(url, http):
+        if url.endswith('/4'):
+            raise ValueError('parse error')
+        return await http.fetch(url)
+
+    try:
+        results = dict(iter_fetch_async((stub_server.url(path) for path in paths), worker, client, concurrency=2))
+    finally:
+        client.close()
+
+    assert results[stub_server.url('/jobs/view/2')] is None
+    assert results[stub_server.url('/jobs/view/4')] is None
+    for path in ('/jobs/view/0', '/jobs/view/1', '/jobs/view/3'):
+        assert results[stub_server.url(path)] == page(path)
+    assert stub_server.hits['/jobs/view/2'] == 1
@@ -0,0 +1,105 @@
+import time
+
+import frontier as F
+from rate_limit import SharedHostRateLimiter
+
+CONFIG = {
+    'job_search': {'location': 'Berlin', 'locations': ['Berlin', 'Remote'], 'job_titles': ['Data Scientist']},
+    'linkedin': {'base_url': 'https://www.linkedin.com/jobs/search'},
+}
+
+
+def job(i: int) -> tuple:
+    return ('job', f"https://www.linkedin.com/jobs/view/role-{i}?refId=x", {})
+
+
+def test_claims_never_overlap(tmp_path):
+    path = str(tmp_path / 'frontier.sqlite')
+    first, second = F.Frontier(path), F.Frontier(path)
+    try:
+        assert first.add([job(i) for i in range(5)]) == 5
+        # the same posting found again under another url is not queued twice
+        assert first.add([('job', 'https://www.linkedin.com/jobs/view/other-slug-3', {})]) == 0
+
+        a = first.claim('a', limit=3)
+        b = second.claim('b', limit=3)
+        assert len(a) == 3 and len(b) == 2
+        assert not {t['id'] for t in a} & {t['id'] for t in b}
+        # only the lease owner can complete a task
+        assert not second.complete(a[0]['id'], 'b')
+        assert first.complete(a[0]['id'], 'a')
+    finally:
+        first.close()
+        second.close()
+
+
+def test_expired_lease_is_reclaimed_until_attempts_run_out(tmp_path):
+    frontier = F.Frontier(str(tmp_path / 'frontier.sqlite'), lease_seconds=0.01, max_attempts=2)
+    try:
+        frontier.add([job(1)])
+        [task] = frontier.claim('crashed')
+        time.sleep(0.02)
+        [again] = frontier.claim('other')
+        assert again['id'] == task['id'] and again['attempts'] == 2
+        # the first owner's late completion is rejected
+        assert not frontier.complete(task['id'], 'crashed')
+
+        time.sleep(0.02)
+        assert frontier.reclaim_expired() == 1
+        assert frontier.counts() == {'job': {'failed': 1}}
+    finally:
+        frontier.close()
+
+
+def test_failed_task_is_retried_after_backoff(tmp_path):
+    frontier = F.Frontier(str(tmp_path / 'frontier.sqlite'), retry_backoff=0.05, max_attempts=3)
+    try:
+        frontier.add([job(1)])
+        [task] = frontier.claim('w')
+        assert frontier.fail(task['id'], 'w', 'HTTP 503')
+        assert frontier.claim('w') == []
+        time.sleep(0.06)
+        assert [t['id'] for t in frontier.claim('w')] == [task['id']]
+    finally:
+        frontier.close()
+
+
+def test_searches_are_seeded_once_per_crawl(tmp_path):
+    frontier = F.Frontier(str(tmp_path / 'frontier.sqlite'))
+    try:
+        assert F.seed_searches(frontier, CONFIG, crawl='day-1') == 2
+        assert F.seed_searches(frontier, CONFIG, crawl='day-1') == 0
+        assert F.seed_searches(frontier, CONFIG, crawl='day-2') == 2
+    finally:
+        frontier.close()
+
+
+def test_frontier_from_config_applies_lease_settings(tmp_path):
+    config = {'frontier': {'path': str(tmp_path / 'frontier.sqlite'), 'lease_seconds': 7, 'max_attempts': 9,
+                           'retry_backoff': 1.5}}
+    frontier = F.frontier_from_config(config)
+    try:
+        assert (frontier.lease_seconds, frontier.max_attempts, frontier.retry_backoff) == (7, 9, 1.5)
+    finally:
+        frontier.close()
+
+
+def test_workers_share_one_rate_budget(tmp_path):
+    path = str(tmp_path / 'frontier.sqlite')
+    url = 'https://www.linkedin.com/jobs/view/1'
+    first, second = SharedHostRateLimiter(path, rate=10, capacity=2), SharedHostRateLimiter(path, rate=10, capacity=2)
+    try:
+        assert first.bucket(url).reserve() == 0
+        assert second.bucket(url).reserve() == 0
+        # the burst is spent across both processes, so the next token is 0.1s away for either
+        assert 0.08 < first.bucket(url).reserve() <= 0.1
+
+        # an AIMD slow down by one worker applies to all of them
+        second.bucket(url).adjust_rate(True, min_rate=1, max_rate=10, step=1)
+        assert first.bucket(url).adjust_rate(False, min_rate=1, max_rate=10, step=1) == 6
+
+        first.reset()
+        assert second.bucket(url).reserve() == 0
+    finally:
+        first.close()
+        second.close()
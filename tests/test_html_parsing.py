@@ -0,0 +1,60 @@
+import sys
+
+import pytest
+
+import html_parsing
+from html_parsing import PARSER_BACKENDS, parse_job_details
+
+TOP_CARD = b"""<html><head><title>Data Scientist | Acme | LinkedIn</title>
+<script>var x = "<h1>not a title</h1>";</script></head><body>
+<h1 class="top-card-layout__title">Senior Data Scientist - Pricing</h1>
+<div class="top-card-layout__second-subline"><span>Acme Analytics</span> Charlotte, NC 2 days ago</div>
+<div class="compensation__salary">$150,000.00/yr - $180,000.00/yr</div>
+<section><div class="show-more-less-html__markup">
+<p>Build <strong>pricing</strong> models.</p><ul><li>Python &amp; SQL</li><li>5+ years of experience</li></ul>
+</div></section></body></html>"""
+
+FALLBACK = ("""<html><body><h1>Machine Learning Engineer</h1>
+<div class="other"><div><p>Responsibilities include shipping models. %s</p></div></div>
+<section>short</section></body></html>""" % ("We value experience. " * 20)).encode('utf-8')
+
+EMPTY = b"<html><body><p>Nothing here</p></body></html>"
+
+PAGES = [
+    ('https://www.linkedin.com/jobs/view/senior-data-scientist-at-acme-1', TOP_CARD),
+    ('https://www.linkedin.com/jobs/view/ml-engineer-at-globex-2', FALLBACK),
+    ('https://www.linkedin.com/jobs/view/3', EMPTY),
+]
+
+
+@pytest.mark.parametrize('job_url,page', PAGES)
+def test_backends_extract_the_same_fields(job_url, page):
+    results = {backend: parse_job_details(job_url, page, backend) for backend in PARSER_BACKENDS}
+
+    assert results['lxml'] == results['html.parser']
+    assert results['selectolax'] == results['html.parser']
+
+
+def test_top_card_fields():
+    job = parse_job_details(*PAGES[0])
+
+    assert job['job_name'] == 'Senior Data Scientist'
+    assert job['company'] == 'Acme Analytics'
+    assert job['job_description'].startswith('Build')
+    assert job['compensation']['annual_min'] == 150000
+
+
+def test_missing_selectolax_falls_back_to_html_parser(monkeypatch):
+    html_parsing.resolve_backend.cache_clear()
+    # a None entry makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, 'selectolax.lexbor', None)
+    try:
+        assert html_parsing.resolve_backend('selectolax') == 'html.parser'
+        assert parse_job_details(*PAGES[0], backend='selectolax') == parse_job_details(*PAGES[0], 'html.parser')
+    finally:
+        html_parsing.resolve_backend.cache_clear()
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        parse_job_details(*PAGES[0], backend='regex')
@@ -0,0 +1,46 @@
+from http_cache import ResponseCache
+from http_client import ScraperClient
+from rate_limit import HostRateLimiter
+
+
+def make_client(cache) -> ScraperClient:
+    return ScraperClient(limiter=HostRateLimiter(1000, 100), cache=cache, max_retries=1, backoff=0.0, timeout=5)
+
+
+def test_fresh_entry_skips_the_network(stub_server, tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path / 'cache')
+    url = stub_server.url('/jobs/view/1')
+    cache.put(url, b'cached page')
+    client = make_client(cache)
+    try:
+        assert client.fetch(url) == b'cached page'
+    finally:
+        client.close()
+    assert stub_server.hits['/jobs/view/1'] == 0
+
+
+def test_stale_entry_served_when_revalidation_fails(stub_server, tmp_path):
+    # ttl 0 makes every entry stale; the server keeps failing past the retry budget
+    cache = ResponseCache(cache_dir=tmp_path / 'cache', ttls={'job': 0})
+    url = stub_server.url('/jobs/view/1')
+    cache.put(url, b'stale page')
+    stub_server.scripted['/jobs/view/1'] = [503, 503]
+    client = make_client(cache)
+    try:
+        assert client.fetch(url) == b'stale page'
+    finally:
+        client.close()
+    assert stub_server.hits['/jobs/view/1'] == 2
+
+
+def test_stale_entry_refreshed_when_server_answers(stub_server, tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path / 'cache', ttls={'job': 0})
+    url = stub_server.url('/jobs/view/1')
+    cache.put(url, b'stale page')
+    client = make_client(cache)
+    try:
+        body = client.fetch(url)
+    finally:
+        client.close()
+    assert body.startswith(b'<html>')
+    assert cache.get(url).content == body
@@ -0,0 +1,29 @@
+import threading
+
+from rate_limit import HostRateLimiter, TokenBucket
+
+
+def test_adjust_rate_is_bounded():
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    for _ in range(10):
+        bucket.adjust_rate(True, min_rate=0.1, max_rate=1.0, step=0.05)
+    assert bucket.rate == 0.1
+    for _ in range(100):
+        bucket.adjust_rate(False, min_rate=0.1, max_rate=1.0, step=0.05)
+    assert bucket.rate == 1.0
+
+
+def test_concurrent_adjustments_stay_in_bounds():
+    bucket = HostRateLimiter(rate=1000, capacity=1000).bucket('https://www.linkedin.com/jobs/view/1')
+
+    def hammer(slow_down):
+        for _ in range(2000):
+            bucket.reserve()
+            bucket.adjust_rate(slow_down, min_rate=1, max_rate=1000, step=5)
+
+    threads = [threading.Thread(target=hammer, args=(i % 2 == 0,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 1 <= bucket.rate <= 1000
@@ -0,0 +1,82 @@
+import json
+
+import linkedin_job_scraper
+from job_index import SeenJobsIndex
+from results_log import JsonlResultWriter, read_jsonl
+
+
+def urls(path) -> list:
+    return [record['job_url'] for record in read_jsonl(path)]
+
+
+def test_resume_drops_a_torn_last_line(tmp_path):
+    writer = JsonlResultWriter(tmp_path / 'jobs.jsonl')
+    writer.open()
+    writer.append({'job_url': 'a'})
+    writer.append({'job_url': 'b'})
+    writer._file.write('{"job_url": "x", "job_na')
+    writer.close(complete=False)
+
+    # a crash mid-write leaves a fragment without its newline; resuming must
+    # not glue the next record onto it
+    resumed = JsonlResultWriter(tmp_path / 'jobs.jsonl')
+    assert resumed.open() == {'a', 'b'}
+    resumed.append({'job_url': 'c'})
+    resumed.append({'job_url': 'd'})
+    resumed.close()
+
+    assert urls(tmp_path / 'jobs.jsonl') == ['a', 'b', 'c', 'd']
+
+
+def test_resume_of_a_single_torn_record(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('{"job_url": "a"', encoding='utf-8')
+    JsonlResultWriter(path)._write_checkpoint('running')
+
+    writer = JsonlResultWriter(path)
+    assert writer.open() == set()
+    writer.append({'job_url': 'b'})
+    writer.close()
+
+    assert urls(path) == ['b']
+
+
+def test_completed_run_starts_fresh(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    writer = JsonlResultWriter(path)
+    writer.open()
+    writer.append({'job_url': 'a'})
+    writer.close()
+
+    writer = JsonlResultWriter(path)
+    assert writer.open() == set()
+    writer.append({'job_url': 'b'})
+    writer.close()
+
+    assert urls(path) == ['b']
+    assert json.loads(writer.checkpoint_path.read_text())['status'] == 'complete'
+
+
+def test_job_marked_extracted_only_after_it_is_saved(stub_server, tmp_path, monkeypatch):
+    job_urls = [stub_server.url(f"/jobs/view/{i}") for i in (101, 102)]
+    monkeypatch.setattr(linkedin_job_scraper, 'iter_job_links', lambda config, client, skip_ids: iter(job_urls))
+    index_path = str(tmp_path / 'seen.sqlite')
+    config = {
+        'job_search': {'index_path': index_path},
+        'scraper': {'fetch_mode': 'sequential', 'requests_per_second': 1000, 'burst': 100},
+        'cache': {'mode': 'off'},
+    }
+
+    jobs = linkedin_job_scraper.iter_scraped_jobs(config)
+    next(jobs)
+    index = SeenJobsIndex(index_path)
+    try:
+        # handed to the consumer but not yet acknowledged
+        assert index.extracted_ids() == set()
+        next(jobs)
+        assert index.extracted_ids() == {'101'}
+        # the consumer stops before saving the second job
+        jobs.close()
+        assert index.extracted_ids() == {'101'}
+    finally:
+        index.close()
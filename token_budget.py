@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+offline token estimates for rendered prompts, budget-driven trimming
+of job descriptions and per-run cost/latency projections
+"""
+import math
+import re
+from typing import Callable, List, Tuple, Union
+
+from boilerplate import split_segments
+
+# words, numbers and single punctuation marks, roughly how BPE tokenizers split text
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# per-message framing overhead added by the API
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# phrases marking the parts of a posting worth keeping, and the parts to drop first
+HIGH_VALUE_TERMS = ('responsib', 'requirement', 'qualification', 'experience', 'skill', 'you will',
+                    'degree', 'years', 'lead', 'manage', 'model', 'data', 'python', 'sql', 'machine learning')
+LOW_VALUE_TERMS = ('equal opportunity', 'benefit', 'insurance', '401', 'paid time off', 'pto', 'about us',
+                   'accommodation', 'disabilit', 'veteran', 'privacy', 'perks', 'wellness', 'apply')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate token count without a tokenizer: short words and
+    punctuation count as one token, longer words as one per ~4 characters.
+    """
+    if not text:
+        return 0
+    return sum(1 if len(piece) <= 6 else math.ceil(len(piece) / 4) for piece in _PIECES.findall(text))
+
+
+def _content_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    return '\n'.join(block.get('text', '') for block in content)
+
+
+def estimate_request_tokens(request: Union[str, dict], system_prompt: str = '') -> int:
+    """Estimated input tokens of a plain prompt or a prebuilt `system`/`messages` request."""
+    if isinstance(request, str):
+        return estimate_tokens(system_prompt) + estimate_tokens(request) + MESSAGE_OVERHEAD_TOKENS
+    tokens = estimate_tokens(_content_text(request.get('system', '')))
+    for message in request['messages']:
+        tokens += estimate_tokens(_content_text(message['content'])) + MESSAGE_OVERHEAD_TOKENS
+    return tokens
+
+
+def segment_value(segment: str) -> float:
+    """Relevance score of a description segment: job-specific terms up, company/benefits boilerplate down."""
+    lowered = segment.lower()
+    score = sum(term in lowered for term in HIGH_VALUE_TERMS)
+    score -= 2 * sum(term in lowered for term in LOW_VALUE_TERMS)
+    return score
+
+
+def trim_to_budget(text: str, max_tokens: int) -> Tuple[str, int]:
+    """
+    Drop the lowest-value segments of a job description until it fits in
+    `max_tokens`, keeping the remaining segments in their original order.
+
+    Returns:
+        tuple: (trimmed text, estimated tokens removed).
+    """
+    original = estimate_tokens(text)
+    if original <= max_tokens:
+        return text, 0
+    segments = split_segments(text)
+    costs = [estimate_tokens(segment) for segment in segments]
+    total = sum(costs)
+    # lowest value first; among equals drop later segments first
+    order = sorted(range(len(segments)), key=lambda i: (segment_value(segments[i]), -i))
+    dropped = set()
+    for i in order:
+        if total <= max_tokens:
+            break
+        dropped.add(i)
+        total -= costs[i]
+    trimmed = ' '.join(segment for i, segment in enumerate(segments) if i not in dropped)
+    return trimmed, original - estimate_tokens(trimmed)
+
+
+class TokenBudget:
+    """
+    Pre-flight sizing of requests. fit() renders a request, and if it is
+    over `max_input_tokens` trims the job description to make room; a
+    request that still does not fit (or whose input plus max output would
+    overflow the context window) is reported as oversized so it is never sent.
+    """
+
+    def __init__(self, max_input_tokens: int = 20000, max_output_tokens: int = 2000,
+                 context_window: int = 200000):
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.context_window = context_window
+
+    @property
+    def input_limit(self) -> int:
+        return min(self.max_input_tokens, self.context_window - self.max_output_tokens)
+
+    def fit(self, build_request: Callable[[str], Union[str, dict]], job_description: str,
+            system_prompt: str = '') -> Tuple[Union[str, dict], dict]:
+        """
+        Render `build_request(job_description)`, trimming the description if needed.
+
+        Returns:
+            tuple: (request, info) where info has input_tokens, trimmed_tokens and oversized.
+        """
+        request = build_request(job_description)
+        tokens = estimate_request_tokens(request, system_prompt)
+        trimmed_tokens = 0
+        if tokens > self.input_limit:
+            fixed = estimate_request_tokens(build_request(''), system_prompt)
+            description, trimmed_tokens = trim_to_budget(job_description, max(self.input_limit - fixed, 0))
+            request = build_request(description)
+            tokens = estimate_request_tokens(request, system_prompt)
+        return request, {
+            'input_tokens': tokens,
+            'trimmed_tokens': trimmed_tokens,
+            'oversized': tokens > self.input_limit,
+        }
+
+
+def project_run(input_tokens: List[int], max_output_tokens: int, prices: dict, concurrency: int = 4,
+                latency_seconds: float = 30.0, cached_prefix_tokens: int = 0) -> dict:
+    """
+    Worst-case cost and wall-clock projection for a batch of requests.
+
+    Args:
+        input_tokens (List[int]): estimated input tokens per request.
+        max_output_tokens (int): output cap per request.
+        prices (dict): USD per million tokens for input, output, cache_write and cache_read.
+        concurrency (int): requests in flight.
+        latency_seconds (float): expected latency of one request.
+        cached_prefix_tokens (int): tokens of the shared cached prefix, written once and read afterwards.
+
+    Returns:
+        dict: requests, input/output token totals, cost_usd and wall_clock_seconds.
+    """
+    n = len(input_tokens)
+    total_input = sum(input_tokens)
+    output = n * max_output_tokens
+    if cached_prefix_tokens and n:
+        uncached = total_input - n * cached_prefix_tokens
+        input_cost = (uncached * prices.get('input', 0)
+                      + cached_prefix_tokens * prices.get('cache_write', prices.get('input', 0))
+                      + (n - 1) * cached_prefix_tokens * prices.get('cache_read', prices.get('input', 0)))
+    else:
+        input_cost = total_input * prices.get('input', 0)
+    cost = (input_cost + output * prices.get('output', 0)) / 1_000_000
+    return {
+        'requests': n,
+        'input_tokens': total_input,
+        'max_output_tokens': output,
+        'cost_usd': round(cost, 4),
+        'wall_clock_seconds': math.ceil(n / max(concurrency, 1)) * latency_seconds,
+    }
+
+
+def format_projection(projection: dict) -> str:
+    return (f"{projection['requests']} requests, ~{projection['input_tokens']} input tokens, "
+            f"<= {projection['max_output_tokens']} output tokens, "
+            f"<= ${projection['cost_usd']:.2f}, ~{projection['wall_clock_seconds'] / 60:.1f} min")
@@ -2,14 +2,21 @@
 """
 utilities to support job application agent
 """
-from docx import Document
+from docx_ingest import load_document
 
-def load_docx_text(file_path):
-    doc = Document(file_path)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
+def load_docx_text(file_path, sections=None):
+    """
+    Text of a .docx including tables and page headers, parsed once and cached.
+
+    Args:
+        file_path: path to the .docx file.
+        sections (list): optional section names (e.g. experience, skills, education)
+            to include instead of the whole document.
+
+    Returns:
+        str: the document text.
+    """
+    return load_document(file_path).select(sections)
 
 
 ## ADD GOOGLE SEARCH FUNCTIONALITY LATER (ZJC 09/25/2025)